@@ -0,0 +1,83 @@
+"""Remote validator entrypoint, baked into validator images at
+/opt/swesmith/validator.py (see _create_validator_image in bug_gen_modal.py).
+
+Runs the configured test command in the sandbox, streams output to the
+mounted volume, and prints a <<RESULT_JSON>> summary for the host to parse.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# We need to make sure we can import these.
+# The image sets PYTHONPATH=/root, and swesmith is at /root/swesmith
+if "/root" not in sys.path:
+    sys.path.append("/root")
+
+from swesmith.constants import TEST_OUTPUT_END, TEST_OUTPUT_START
+
+
+def main():
+    try:
+        config_path = sys.argv[1]
+        with open(config_path, "r") as f:
+            config = json.load(f)
+
+        test_cmd = config["test_cmd"]
+        output_path = Path(config["output_path"])
+        instance = config["instance"]
+
+        # Ensure output directory exists (it's on a volume mount)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Run test command
+        print(f"Executing test: {test_cmd}")
+
+        full_cmd = f"set -uxo pipefail; {test_cmd} || true"
+
+        # execution - explicit argv (no shell=True indirection), streaming
+        # line-by-line straight to the volume file instead of buffering the
+        # whole run in memory (test logs can be hundreds of MB)
+        proc = subprocess.Popen(
+            ["/bin/bash", "-c", full_cmd],
+            shell=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True,
+            errors="replace",
+        )
+        with open(output_path, "w", encoding="utf-8") as out_f:
+            # Sentinels written directly; format must match read_test_output,
+            # which looks for the set -x trace of the old `: 'marker'` no-ops
+            out_f.write(f"+ : '{TEST_OUTPUT_START}'\n")
+            for line in proc.stdout:
+                out_f.write(line)
+            out_f.write(f"+ : '{TEST_OUTPUT_END}'\n")
+        exit_code = proc.wait()
+        print(f"Saved output to {output_path}")
+
+        # Grading happens host-side in the long-lived grade_remote function;
+        # the sandbox only runs tests and persists raw output
+        result_summary = {
+            "instance_id": instance.get("instance_id"),
+            "valid": False,
+            "error": None,
+            "exit_code": exit_code,
+        }
+
+        # Output result as JSON marked with special tags
+        print(f"\n<<RESULT_JSON>>{json.dumps(result_summary)}<<RESULT_JSON>>")
+
+    except Exception as e:
+        import traceback
+
+        traceback.print_exc()
+        # Fallback error result
+        res = {"valid": False, "error": str(e)}
+        print(f"\n<<RESULT_JSON>>{json.dumps(res)}<<RESULT_JSON>>")
+
+
+if __name__ == "__main__":
+    main()
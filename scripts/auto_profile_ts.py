@@ -19,15 +19,105 @@ Usage:
 """
 
 import argparse
+import base64
+import fcntl
+import functools
 import json
+from concurrent.futures import ThreadPoolExecutor
 import os
 import subprocess
 import tempfile
-from dataclasses import dataclass
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 
+@functools.lru_cache(maxsize=1024)
+def _class_name_for(repo: str) -> str:
+    """repo 名 → Profile 类名（批量模式下同一 repo 可能出现多次，缓存住）"""
+    return (
+        "".join(word.capitalize() for word in repo.replace("-", "_").split("_"))
+        + "Profile"
+    )
+
+
+# test_framework → log parser 函数名（不可变查找表，模块级只建一次）
+_PARSER_MAP = MappingProxyType({
+    "jest": "parse_log_jest",
+    "vitest": "parse_log_vitest",
+    "mocha": "parse_log_mocha",
+})
+
+# lockfile 存在时使用锁定安装：跳过依赖解析、不改写 lockfile、构建可复现
+_LOCKFILE_NAMES = frozenset({
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lockb",
+})
+
+_FROZEN_INSTALL_CMDS = MappingProxyType({
+    "npm": "npm ci",
+    "yarn": "yarn install --immutable",
+    "pnpm": "pnpm install --frozen-lockfile",
+    "bun": "bun install --frozen-lockfile",
+})
+
+# 各包管理器的 tarball 缓存目录 → BuildKit cache mount 的挂载点，
+# 让重复构建镜像时跳过依赖下载
+_PM_CACHE_DIRS = MappingProxyType({
+    "npm": "/root/.npm",
+    "yarn": "/usr/local/share/.cache/yarn",
+    "pnpm": "/root/.local/share/pnpm/store",
+    "bun": "/root/.bun/install/cache",
+})
+
+# orjson 是可选加速依赖（`pip install -e .[fast]`），大型 package.json 解析快 2-3 倍
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# ijson 同为可选依赖：巨型 monorepo manifest 可以流式只取需要的三个字段
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# detect_test_framework 只读这三个字段，其余（workspaces/keywords/...）全是解析浪费
+_PACKAGE_JSON_FIELDS = ("scripts", "dependencies", "devDependencies")
+
+# 小文件整体解析更快（流式解析的 setup 开销占主导）
+_STREAM_PARSE_THRESHOLD = 4 * 1024
+
+
+def _read_package_json_fields(path: str | Path) -> dict:
+    """读取 package.json，只保留 scripts/dependencies/devDependencies
+
+    大于 4 KB 且 ijson 可用时流式解析，凑齐三个字段即提前终止；
+    否则整体解析后裁剪。
+    """
+    path = Path(path)
+    if ijson is not None and path.stat().st_size > _STREAM_PARSE_THRESHOLD:
+        result: dict = {}
+        with open(path, "rb") as f:
+            for key, value in ijson.kvitems(f, ""):
+                if key in _PACKAGE_JSON_FIELDS:
+                    result[key] = value
+                    if len(result) == len(_PACKAGE_JSON_FIELDS):
+                        break
+        return result
+
+    package_json = _loads(path.read_bytes())
+    return {k: package_json[k] for k in _PACKAGE_JSON_FIELDS if k in package_json}
+
+
 @dataclass
 class RepoConfig:
     """自动检测到的仓库配置"""
@@ -39,46 +129,144 @@ class RepoConfig:
     test_cmd: str
     install_cmd: str
     node_version: str = "20"
+    # 由 repo 名推导的 Profile 类名，只计算一次，所有调用点共享
+    class_name: str = field(init=False)
+
+    def __post_init__(self):
+        self.class_name = _class_name_for(self.repo)
+
+
+# detect_package_manager / detect_test_framework 只读这几个文件，
+# 部分克隆时也只需检出它们
+_CONFIG_FILES = (
+    "package.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lockb",
+    "package-lock.json",
+)
+
+
+# 跨调用共享的裸镜像缓存：同一仓库的 pack 数据只需下载一次，
+# 之后任意 commit 的克隆都走本地磁盘
+_MIRROR_CACHE_DIR = Path.home() / ".cache" / "swesmith" / "mirrors"
+
+
+def _ensure_mirror(owner: str, repo: str) -> Optional[Path]:
+    """创建/刷新裸镜像缓存；任何失败都返回 None，直接走普通克隆"""
+    repo_url = f"https://github.com/{owner}/{repo}.git"
+    mirror_path = _MIRROR_CACHE_DIR / f"{owner}__{repo}.git"
+    try:
+        _MIRROR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        lock_path = _MIRROR_CACHE_DIR / f"{owner}__{repo}.lock"
+        with open(lock_path, "w") as lock_file:
+            # 并发 worker 共享镜像，文件锁避免 clone/fetch 互相踩踏
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if not mirror_path.exists():
+                result = subprocess.run(
+                    ["git", "clone", "--bare", "--filter=blob:none",
+                     repo_url, str(mirror_path)],
+                    check=False,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                if result.returncode != 0:
+                    return None
+            else:
+                subprocess.run(
+                    ["git", "-C", str(mirror_path), "fetch", "--filter=blob:none",
+                     "origin",
+                     "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"],
+                    check=False,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+        return mirror_path
+    except OSError:
+        return None
 
 
 def clone_repo(owner: str, repo: str, commit: Optional[str], temp_dir: str) -> str:
-    """克隆仓库到临时目录"""
+    """克隆仓库到临时目录（blob:none 部分克隆，按需只检出配置文件）"""
     repo_url = f"https://github.com/{owner}/{repo}.git"
     repo_path = os.path.join(temp_dir, repo)
-    
+
     print(f"  正在克隆 {owner}/{repo}...")
-    subprocess.run(
-        ["git", "clone", "--depth", "1", repo_url, repo_path],
-        check=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-    
+    # --filter=blob:none 只下载 commit/tree 元数据，blob 按需取；
+    # --no-checkout 避免物化整个工作树（我们只读 _CONFIG_FILES）
+    base_cmd = [
+        "git",
+        "-c",
+        "protocol.version=2",
+        "clone",
+        "--filter=blob:none",
+        "--no-checkout",
+        "--depth",
+        "1",
+    ]
+
+    # 同仓库的重复检测直接引用本地镜像的对象库，避免再次下载 pack
+    mirror_path = _ensure_mirror(owner, repo)
+    if mirror_path is not None:
+        base_cmd += ["--reference", str(mirror_path), "--dissociate"]
+
+    cloned_at_ref = False
     if commit:
-        # Fetch the specific commit/tag
+        # tag/分支名可以直接在克隆时指定，一次网络往返搞定
+        result = subprocess.run(
+            base_cmd + ["--branch", commit, repo_url, repo_path],
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        cloned_at_ref = result.returncode == 0
+
+    if not cloned_at_ref:
         subprocess.run(
-            ["git", "-C", repo_path, "fetch", "--depth", "1", "origin", commit],
+            base_cmd + [repo_url, repo_path],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    ref = "HEAD"
+    if commit and not cloned_at_ref:
+        # 裸 commit SHA：单独抓取该提交（仍然 blob:none）
+        result = subprocess.run(
+            ["git", "-C", repo_path, "fetch", "--depth", "1",
+             "--filter=blob:none", "origin", commit],
             check=False,  # May fail for tags
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
+        if result.returncode == 0:
+            ref = "FETCH_HEAD"
+
+    # 只检出实际会读的文件；不存在的 lockfile 忽略即可
+    for filename in _CONFIG_FILES:
         subprocess.run(
-            ["git", "-C", repo_path, "checkout", commit],
+            ["git", "-C", repo_path, "checkout", ref, "--", filename],
             check=False,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
-    
+
     return repo_path
 
 
 def detect_package_manager(repo_path: str) -> str:
-    """检测包管理器"""
-    if os.path.exists(os.path.join(repo_path, "pnpm-lock.yaml")):
+    """检测包管理器（单次 scandir 拿到全部根目录文件，替代逐个 stat）"""
+    root_names = {entry.name for entry in os.scandir(repo_path)}
+    return detect_package_manager_from_tree(root_names)
+
+
+def detect_package_manager_from_tree(root_names: set[str]) -> str:
+    """从仓库根目录文件名集合检测包管理器（API 路径：无需本地文件）"""
+    if "pnpm-lock.yaml" in root_names:
         return "pnpm"
-    elif os.path.exists(os.path.join(repo_path, "yarn.lock")):
+    elif "yarn.lock" in root_names:
         return "yarn"
-    elif os.path.exists(os.path.join(repo_path, "bun.lockb")):
+    elif "bun.lockb" in root_names:
         return "bun"
     else:
         return "npm"
@@ -109,86 +297,157 @@ def detect_test_framework(package_json: dict, package_manager: str) -> tuple[str
     deps = package_json.get("dependencies", {})
     all_deps = {**deps, **dev_deps}
     pm = package_manager  # npm, yarn, or pnpm
-    
-    # Step 1: 收集所有"纯测试"脚本（不含 && 链式命令）
-    pure_test_scripts = {}
+
+    # Step 1: 单次遍历 scripts——拼出全文用于存在性检查，
+    # 同时把"纯测试"脚本（不含 && 链式命令）按 runner 分桶
+    all_scripts_text = "\n".join(scripts.values())
+    pure_scripts_by_runner: dict[str, list[tuple[str, str]]] = {
+        "vitest": [],
+        "jest": [],
+        "mocha": [],
+        "test": [],  # 名字里带 test 的兜底候选
+    }
     for name, cmd in scripts.items():
         if "&&" in cmd:
             continue
-        pure_test_scripts[name] = cmd
-    
+        for runner in ("vitest", "jest", "mocha"):
+            if runner in cmd:
+                pure_scripts_by_runner[runner].append((name, cmd))
+        if "test" in name:
+            pure_scripts_by_runner["test"].append((name, cmd))
+
     # Step 2: 检测 Vitest
-    if "vitest" in all_deps or any("vitest" in v for v in scripts.values()):
-        # 优先找调用 vitest 的纯脚本
-        for name, cmd in pure_test_scripts.items():
-            if "vitest" in cmd:
-                # 使用 npm run <script> 模式（原始 JS profiles 主流模式）
-                return "vitest", f"{pm} run {name} -- --reporter verbose"
+    if "vitest" in all_deps or "vitest" in all_scripts_text:
+        # 优先找调用 vitest 的纯脚本（npm run <script> 是原始 JS profiles 主流模式）
+        if pure_scripts_by_runner["vitest"]:
+            name, _ = pure_scripts_by_runner["vitest"][0]
+            return "vitest", f"{pm} run {name} -- --reporter verbose"
         # 没有纯脚本时用 ./node_modules/.bin/ 模式（避免 npx 下载）
         return "vitest", "./node_modules/.bin/vitest run --reporter verbose"
-    
+
     # Step 3: 检测 Jest
-    if "jest" in all_deps or "ts-jest" in all_deps or any("jest" in v for v in scripts.values()):
-        # 优先找调用 jest 的纯脚本
-        for name, cmd in pure_test_scripts.items():
-            if "jest" in cmd and "test" in name:
+    if "jest" in all_deps or "ts-jest" in all_deps or "jest" in all_scripts_text:
+        # 优先找调用 jest 且名字带 test 的纯脚本
+        for name, _ in pure_scripts_by_runner["jest"]:
+            if "test" in name:
                 return "jest", f"{pm} run {name} --verbose"
         # 没有纯脚本时用 ./node_modules/.bin/ 模式
         return "jest", "./node_modules/.bin/jest --verbose --no-color"
-    
+
     # Step 4: 检测 Mocha
-    if "mocha" in all_deps or any("mocha" in v for v in scripts.values()):
-        for name, cmd in pure_test_scripts.items():
-            if "mocha" in cmd:
-                return "mocha", f"{pm} run {name} -- --reporter spec"
+    if "mocha" in all_deps or "mocha" in all_scripts_text:
+        if pure_scripts_by_runner["mocha"]:
+            name, _ = pure_scripts_by_runner["mocha"][0]
+            return "mocha", f"{pm} run {name} -- --reporter spec"
         return "mocha", "./node_modules/.bin/mocha --reporter spec"
-    
+
     # Step 5: 检测 node --test (Node.js 内置测试运行器)
-    if any("node --test" in v or "node:test" in v for v in scripts.values()):
+    if "node --test" in all_scripts_text or "node:test" in all_scripts_text:
         return "node_test", "node --test"
-    
+
     # Step 6: 检测 Ava
     if "ava" in all_deps:
         return "ava", "./node_modules/.bin/ava --verbose"
-    
+
     # Step 7: 兜底 -- 找最合适的纯测试脚本
-    for name, cmd in pure_test_scripts.items():
-        if "test" in name:
-            return "unknown", f"{pm} run {name} --verbose"
-    
+    if pure_scripts_by_runner["test"]:
+        name, _ = pure_scripts_by_runner["test"][0]
+        return "unknown", f"{pm} run {name} --verbose"
+
     # 最终兜底：./node_modules/.bin/jest（大多数 TS 仓库用 jest）
     return "jest", "./node_modules/.bin/jest --verbose --no-color"
 
 
-def detect_config(owner: str, repo: str, commit: Optional[str]) -> RepoConfig:
-    """自动检测仓库配置"""
-    print(f"\n🔍 正在分析仓库: {owner}/{repo}")
-    
+def _github_api_json(url: str) -> dict:
+    """GET 一个 GitHub API endpoint 并解析 JSON 响应"""
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    request = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(request, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def _build_config(
+    owner: str,
+    repo: str,
+    commit: str,
+    package_json: dict,
+    pm: str,
+    has_lockfile: bool = False,
+) -> RepoConfig:
+    """由已解析的 package.json + 包管理器组装 RepoConfig"""
+    print(f"  📦 包管理器: {pm}")
+
+    # 检测测试框架
+    framework, test_cmd = detect_test_framework(package_json, pm)
+    print(f"  🧪 测试框架: {framework}")
+
+    # 确定安装命令：有 lockfile 时用锁定安装（npm ci 等），否则普通 install
+    if has_lockfile:
+        install_cmd = _FROZEN_INSTALL_CMDS.get(pm, f"{pm} install")
+    else:
+        install_cmd = f"{pm} install"
+
+    # test_cmd 已由 detect_test_framework 完整生成（包含包管理器前缀）
+    print(f"  ▶️  测试命令: {test_cmd}")
+
+    return RepoConfig(
+        owner=owner,
+        repo=repo,
+        commit=commit,
+        package_manager=pm,
+        test_framework=framework,
+        test_cmd=test_cmd,
+        install_cmd=install_cmd,
+    )
+
+
+def _detect_config_via_api(owner: str, repo: str, commit: Optional[str]) -> RepoConfig:
+    """通过 GitHub REST API 检测配置（两三个 HTTP GET，零克隆、零磁盘写）"""
+    api_base = f"https://api.github.com/repos/{owner}/{repo}"
+
+    ref = commit
+    if not ref:
+        ref = _github_api_json(api_base)["default_branch"]
+
+    # package.json 内容（base64 编码）
+    contents = _github_api_json(f"{api_base}/contents/package.json?ref={ref}")
+    package_json = _loads(base64.b64decode(contents["content"]))
+
+    # 根目录文件列表 → lockfile 检测
+    tree = _github_api_json(f"{api_base}/git/trees/{ref}")
+    root_names = {entry["path"] for entry in tree.get("tree", [])}
+    pm = detect_package_manager_from_tree(root_names)
+    has_lockfile = not root_names.isdisjoint(_LOCKFILE_NAMES)
+
+    # 获取实际 commit
+    if not commit:
+        commit = _github_api_json(f"{api_base}/commits/{ref}")["sha"][:8]
+
+    return _build_config(owner, repo, commit, package_json, pm, has_lockfile)
+
+
+def _detect_config_via_clone(
+    owner: str, repo: str, commit: Optional[str]
+) -> RepoConfig:
+    """通过本地克隆检测配置（API 不可用时的回退路径）"""
     with tempfile.TemporaryDirectory() as temp_dir:
         repo_path = clone_repo(owner, repo, commit, temp_dir)
-        
+
         # 读取 package.json
         package_json_path = os.path.join(repo_path, "package.json")
         if not os.path.exists(package_json_path):
             raise ValueError(f"找不到 package.json: {package_json_path}")
-        
-        with open(package_json_path) as f:
-            package_json = json.load(f)
-        
-        # 检测包管理器
-        pm = detect_package_manager(repo_path)
-        print(f"  📦 包管理器: {pm}")
-        
-        # 检测测试框架
-        framework, test_cmd = detect_test_framework(package_json, pm)
-        print(f"  🧪 测试框架: {framework}")
-        
-        # 确定安装命令
-        install_cmd = f"{pm} install"
-        
-        # test_cmd 已由 detect_test_framework 完整生成（包含包管理器前缀）
-        print(f"  ▶️  测试命令: {test_cmd}")
-        
+
+        package_json = _read_package_json_fields(package_json_path)
+
+        # 检测包管理器 + lockfile（一次 scandir 拿到根目录文件集合）
+        root_names = {entry.name for entry in os.scandir(repo_path)}
+        pm = detect_package_manager_from_tree(root_names)
+        has_lockfile = not root_names.isdisjoint(_LOCKFILE_NAMES)
+
         # 获取实际 commit
         if not commit:
             result = subprocess.run(
@@ -197,32 +456,131 @@ def detect_config(owner: str, repo: str, commit: Optional[str]) -> RepoConfig:
                 text=True,
             )
             commit = result.stdout.strip()[:8]
-        
-        return RepoConfig(
-            owner=owner,
-            repo=repo,
-            commit=commit,
-            package_manager=pm,
-            test_framework=framework,
-            test_cmd=test_cmd,
-            install_cmd=install_cmd,
+
+        return _build_config(owner, repo, commit, package_json, pm, has_lockfile)
+
+
+# 检测结果缓存：commit SHA 是内容寻址的，同一 (owner, repo, commit) 的
+# 结果永不过期。schema 版本号用于 RepoConfig 字段变化时整体失效。
+_DETECT_CACHE_DIR = Path.home() / ".cache" / "swesmith" / "auto_profile"
+_DETECT_CACHE_SCHEMA = 2
+
+
+def _detect_cache_path(owner: str, repo: str, commit: str) -> Path:
+    return _DETECT_CACHE_DIR / f"{owner}__{repo}__{commit}.json"
+
+
+def _load_cached_config(
+    owner: str, repo: str, commit: Optional[str]
+) -> Optional[RepoConfig]:
+    """从磁盘缓存读取 RepoConfig；commit 为空时 key 不稳定，跳过缓存"""
+    if not commit:
+        return None
+    path = _detect_cache_path(owner, repo, commit)
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if data.get("schema") != _DETECT_CACHE_SCHEMA:
+        return None
+    config_data = data["config"]
+    config_data.pop("class_name", None)  # init=False 字段由 __post_init__ 重建
+    return RepoConfig(**config_data)
+
+
+def _save_cached_config(config: RepoConfig) -> None:
+    """把检测结果写入磁盘缓存（commit 此时已解析为具体 SHA/tag）"""
+    try:
+        _DETECT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _detect_cache_path(config.owner, config.repo, config.commit)
+        path.write_text(
+            json.dumps({"schema": _DETECT_CACHE_SCHEMA, "config": asdict(config)})
         )
+    except OSError:
+        pass  # 缓存写失败不影响主流程
+
+
+def _is_full_sha(commit: Optional[str]) -> bool:
+    """判断是否为 40 位完整 commit SHA"""
+    if not commit or len(commit) != 40:
+        return False
+    return all(c in "0123456789abcdef" for c in commit.lower())
+
+
+def _detect_config_via_mirror(
+    owner: str, repo: str, commit: str
+) -> Optional[RepoConfig]:
+    """完整 SHA + 本地镜像：直接从对象库流式读取配置，零工作树物化
+
+    `cat-file blob` 只取 package.json 一个 blob，`ls-tree` 只列根目录
+    文件名——不需要 checkout，也不需要任何网络请求。
+    """
+    mirror_path = _MIRROR_CACHE_DIR / f"{owner}__{repo}.git"
+    if not mirror_path.exists():
+        return None
+
+    git = ["git", "-C", str(mirror_path)]
+    result = subprocess.run(
+        git + ["cat-file", "blob", f"{commit}:package.json"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        return None  # commit 不在镜像里（或没有 package.json），走常规路径
+    package_json = _loads(result.stdout)
+
+    result = subprocess.run(
+        git + ["ls-tree", "--name-only", commit],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    root_names = set(result.stdout.splitlines())
+    pm = detect_package_manager_from_tree(root_names)
+    has_lockfile = not root_names.isdisjoint(_LOCKFILE_NAMES)
+
+    print("  ⚡ 命中本地镜像，直接从对象库读取")
+    return _build_config(owner, repo, commit, package_json, pm, has_lockfile)
+
+
+def detect_config(owner: str, repo: str, commit: Optional[str]) -> RepoConfig:
+    """自动检测仓库配置"""
+    print(f"\n🔍 正在分析仓库: {owner}/{repo}")
+
+    cached = _load_cached_config(owner, repo, commit)
+    if cached is not None:
+        print(f"  ⚡ 命中缓存: {cached.owner}/{cached.repo}@{cached.commit}")
+        return cached
+
+    # 显式 40 位 SHA 且镜像已有该提交时，完全跳过网络
+    if _is_full_sha(commit):
+        config = _detect_config_via_mirror(owner, repo, commit)
+        if config is not None:
+            _save_cached_config(config)
+            return config
+
+    try:
+        config = _detect_config_via_api(owner, repo, commit)
+    except (urllib.error.URLError, KeyError, ValueError) as e:
+        # 403（限流）、网络故障或意外响应时回退到克隆
+        print(f"  ⚠️ GitHub API 不可用 ({e})，回退到 git clone")
+        config = _detect_config_via_clone(owner, repo, commit)
+
+    _save_cached_config(config)
+    return config
 
 
 def generate_profile_code(config: RepoConfig) -> str:
     """生成 Profile 类代码"""
     
     # 选择正确的 log_parser
-    parser_map = {
-        "jest": "parse_log_jest",
-        "vitest": "parse_log_vitest",
-        "mocha": "parse_log_mocha",
-    }
-    parser = parser_map.get(config.test_framework, "parse_log_jest")
-    
-    # 生成类名
-    class_name = f"{''.join(word.capitalize() for word in config.repo.replace('-', '_').split('_'))}Profile"
-    
+    parser = _PARSER_MAP.get(config.test_framework, "parse_log_jest")
+
+    # BuildKit cache mount：包管理器缓存跨镜像构建复用
+    pm_cache_dir = _PM_CACHE_DIRS.get(config.package_manager, "/root/.npm")
+
+    class_name = config.class_name
+
     code = f'''
 @dataclass
 class {class_name}(TypeScriptProfile):
@@ -240,12 +598,13 @@ class {class_name}(TypeScriptProfile):
 
     @property
     def dockerfile(self) -> str:
-        return f"""FROM node:{config.node_version}-bullseye
+        return f"""# syntax=docker/dockerfile:1.4
+FROM node:{config.node_version}-bullseye
 RUN apt-get update && apt-get install -y git && rm -rf /var/lib/apt/lists/*
 RUN git clone https://github.com/{{self.mirror_name}} /{{ENV_NAME}}
 WORKDIR /{{ENV_NAME}}
 RUN git checkout {{self.commit}}
-RUN {config.install_cmd}
+RUN --mount=type=cache,target={pm_cache_dir} {config.install_cmd}
 """
 
     def log_parser(self, log: str) -> dict[str, str]:
@@ -292,18 +651,82 @@ from swesmith.profiles.javascript import parse_log_jest, parse_log_vitest, parse
     return output_path
 
 
+def _parse_repo_spec(line: str) -> tuple[str, str, Optional[str]]:
+    """解析 'owner/repo[@commit]' 格式的一行"""
+    spec, _, commit = line.partition("@")
+    owner, repo = spec.split("/", 1)
+    return owner, repo, commit or None
+
+
+def run_batch(args) -> int:
+    """批量模式：并发检测多个仓库，串行生成/保存 Profile"""
+    targets = []
+    for line in Path(args.repos_file).read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if "/" not in line:
+            print(f"⚠️ 跳过无效行: {line}")
+            continue
+        targets.append(_parse_repo_spec(line))
+
+    if not targets:
+        print("❌ 错误: 清单文件中没有有效的仓库")
+        return 1
+
+    print(f"🔍 批量检测 {len(targets)} 个仓库 (并发: {args.concurrency})")
+
+    # detect_config 是 I/O 密集型（HTTP / git 子进程），线程池即可获得并行度
+    def _detect(target: tuple[str, str, Optional[str]]) -> Optional[RepoConfig]:
+        owner, repo, commit = target
+        try:
+            return detect_config(owner, repo, commit)
+        except Exception as e:
+            print(f"❌ {owner}/{repo} 检测失败: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        configs = list(executor.map(_detect, targets))
+
+    # 代码生成 + 保存是快速的纯 CPU 工作，串行执行避免文件写竞争
+    saved = 0
+    for config in configs:
+        if config is None:
+            continue
+        code = generate_profile_code(config)
+        if args.dry_run:
+            print(code)
+        else:
+            save_profile(config, code)
+        saved += 1
+
+    print(f"\n✅ 完成: {saved}/{len(targets)} 个 Profile")
+    return 0 if saved == len(targets) else 1
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="自动生成 TypeScript 仓库的 Profile"
     )
     parser.add_argument(
         "repo",
+        nargs="?",
         help="仓库名称 (格式: owner/repo)"
     )
     parser.add_argument(
         "--commit",
         help="指定 commit/tag (默认: 最新)"
     )
+    parser.add_argument(
+        "--repos-file",
+        help="批量模式：每行一个 owner/repo[@commit] 的清单文件"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="批量模式下并发检测数 (默认: 8)"
+    )
     parser.add_argument(
         "--run",
         action="store_true",
@@ -316,7 +739,14 @@ def main():
     )
     
     args = parser.parse_args()
-    
+
+    if args.repos_file:
+        return run_batch(args)
+
+    if not args.repo:
+        print("❌ 错误: 需要指定 owner/repo 或 --repos-file")
+        return 1
+
     # 解析仓库名
     if "/" not in args.repo:
         print(f"❌ 错误: 仓库名格式应为 owner/repo，收到: {args.repo}")
@@ -342,8 +772,8 @@ def main():
         
         # 保存 Profile
         profile_path = save_profile(config, code)
-        class_name = f"{''.join(word.capitalize() for word in config.repo.replace('-', '_').split('_'))}Profile"
-        
+        class_name = config.class_name
+
         if args.run:
             print("\n🚀 开始运行完整流程...")
             subprocess.run([
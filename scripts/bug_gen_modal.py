@@ -6,29 +6,76 @@ Run with: modal run scripts/bug_gen.py [OPTIONS]
 """
 
 import asyncio
+import functools
+import io
 import json
 import logging
-import shutil
+import os
+import re
+import statistics
 import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 
 import modal
 
+try:  # Optional speedup for large patch lists (install with swesmith[fast])
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # Optional: vectorized stats tables (numpy ships with the `all` extras)
+    import numpy as np
+except ImportError:
+    np = None
+
 modal.enable_output()
 
 
+def _json_loads(data: str | bytes):
+    """json.loads with an orjson fast path when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> str:
+    """Compact json.dumps with an orjson fast path when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_dumps_indent(obj) -> str:
+    """Pretty (2-space) json.dumps with an orjson fast path when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
 # ============================================================================
 # Asyncio Exception Logging (to diagnose 'socket.send() raised exception')
 # ============================================================================
 
 
+# Cap on distinct keys tracked by the dedup structures below; beyond this the
+# least-recently-seen entries are evicted so long runs can't leak memory
+_DEDUP_MAX_KEYS = 10_000
+
+
 class DeduplicatingFilter(logging.Filter):
     """A logging filter that suppresses repeated log messages after a threshold."""
 
     def __init__(self, max_repeats: int = 5):
         super().__init__()
         self.max_repeats = max_repeats
-        self._message_counts: dict[str, int] = {}
+        self._message_counts: OrderedDict[str, int] = OrderedDict()
 
     def filter(self, record: logging.LogRecord) -> bool:
         # Create a key from the log message (truncate to avoid memory issues)
@@ -37,6 +84,11 @@ class DeduplicatingFilter(logging.Filter):
         self._message_counts[msg_key] = self._message_counts.get(msg_key, 0) + 1
         count = self._message_counts[msg_key]
 
+        # LRU-style bounded eviction so unique messages can't grow unbounded
+        self._message_counts.move_to_end(msg_key)
+        if len(self._message_counts) > _DEDUP_MAX_KEYS:
+            self._message_counts.popitem(last=False)
+
         if count <= self.max_repeats:
             if count == self.max_repeats:
                 # Modify the message to indicate suppression
@@ -81,7 +133,8 @@ def setup_asyncio_exception_logging():
     )
 
     # Store exception counts to avoid log spam for unhandled exceptions
-    _exception_counts: dict[str, int] = {}
+    # (bounded like DeduplicatingFilter so long runs can't leak memory)
+    _exception_counts: OrderedDict[str, int] = OrderedDict()
 
     def custom_exception_handler(loop, context):
         """Custom exception handler that logs full exception details with deduplication."""
@@ -94,6 +147,9 @@ def setup_asyncio_exception_logging():
 
         _exception_counts[exc_key] = _exception_counts.get(exc_key, 0) + 1
         count = _exception_counts[exc_key]
+        _exception_counts.move_to_end(exc_key)
+        if len(_exception_counts) > _DEDUP_MAX_KEYS:
+            _exception_counts.popitem(last=False)
 
         # Only log full details for first 5 occurrences of each type
         if count <= 5:
@@ -127,163 +183,115 @@ MINUTES = 60
 MODAL_TIMEOUT = 10 * MINUTES
 SANDBOX_RATE_LIMIT = 4  # Modal limits to 5/s, use 4 to be safe
 
-LANGUAGE_TO_BASE_CLASS = {
-    "python": "PythonProfile",
-    "javascript": "JavaScriptProfile",
-    "typescript": "JavaScriptProfile",
-    "golang": "GoProfile",
-    "go": "GoProfile",
-    "rust": "RustProfile",
-    "java": "JavaProfile",
-    "c": "CProfile",
-    "cpp": "CppProfile",
-    "csharp": "CSharpProfile",
-    "php": "PhpProfile",
-}
+# Immutable: wrapped in MappingProxyType so lookups can't be invalidated by
+# accidental mutation elsewhere in the module
+LANGUAGE_TO_BASE_CLASS = MappingProxyType(
+    {
+        "python": "PythonProfile",
+        "javascript": "JavaScriptProfile",
+        "typescript": "JavaScriptProfile",
+        "golang": "GoProfile",
+        "go": "GoProfile",
+        "rust": "RustProfile",
+        "java": "JavaProfile",
+        "c": "CProfile",
+        "cpp": "CppProfile",
+        "csharp": "CSharpProfile",
+        "php": "PhpProfile",
+    }
+)
+_SUPPORTED_LANGUAGES = frozenset(LANGUAGE_TO_BASE_CLASS)
 
 TEST_OUTPUT_START = ">>>>> Start Test Output"
 TEST_OUTPUT_END = ">>>>> End Test Output"
+# Where the validator entrypoint (scripts/_remote_validator.py) is baked into
+# every validator image
+VALIDATOR_IMAGE_PATH = "/opt/swesmith/validator.py"
 PREGOLD_TIMEOUT = 200  # seconds - skip post-gold if baseline exceeds this
 MIN_PATCHES_FOR_VALIDATION = 50  # skip repos with fewer patches
+POSTGOLD_BATCH_SIZE = 10  # patches validated per sandbox (amortizes startup)
 
-REMOTE_VALIDATOR_SCRIPT = r"""
-import sys
-import json
-import subprocess
-import os
-from pathlib import Path
+# Upper bound on instantiated-but-unfinished asyncio Tasks per fan-out.
+# asyncio.as_completed over a prebuilt list creates every Task eagerly; with
+# very large patch sets that is millions of pending Task objects and real GC
+# pressure. Sized above the default sandbox concurrency (900) so the window
+# never starves the semaphore.
+MAX_PENDING_TASKS = 1000
 
-# We need to make sure we can import these. 
-# The image sets PYTHONPATH=/root, and swesmith is at /root/swesmith
-if "/root" not in sys.path:
-    sys.path.append("/root")
+# Single cap on concurrent volume RPCs, shared by every fan-out in this
+# module. Past the client's connection-pool size, extra in-flight requests
+# just queue and inflate tail latency, so one bounded pool beats several
+# independent Semaphore(100)s stacking up. Tune with MODAL_VOLUME_MAX_INFLIGHT.
+_VOLUME_SEM = asyncio.Semaphore(int(os.getenv("MODAL_VOLUME_MAX_INFLIGHT", "64")))
 
-from swesmith.harness.grading import get_valid_report
-from swesmith.constants import TEST_OUTPUT_START, TEST_OUTPUT_END
+# ============================================================================
+# Profile & Repo Utilities
+# ============================================================================
 
-def main():
-    try:
-        config_path = sys.argv[1]
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        
-        test_cmd = config['test_cmd']
-        output_path = Path(config['output_path'])
-        baseline_path = Path(config['baseline_path'])
-        report_path = Path(config['report_path'])
-        instance = config['instance']
-        
-        # Ensure output directory exists (it's on a volume mount)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Run test command
-        print(f"Executing test: {test_cmd}")
-        
-        full_cmd = f"set -uxo pipefail; : '{TEST_OUTPUT_START}'; {test_cmd} || true; : '{TEST_OUTPUT_END}'"
-        
-        # execution
-        proc = subprocess.run(
-            full_cmd,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            executable="/bin/bash"
-        )
-        
-        output_bytes = proc.stdout
-        exit_code = proc.returncode
-        
-        # Decode
-        output_str = output_bytes.decode('utf-8', errors='replace')
-        
-        # Write output to volume
-        output_path.write_text(output_str, encoding='utf-8')
-        print(f"Saved output to {output_path}")
-        
-        result_summary = {
-            "instance_id": instance.get("instance_id"),
-            "valid": False,
-            "error": None,
-            "exit_code": exit_code
-        }
 
-        # Check baseline and validate
-        if baseline_path.exists():
-            print(f"Baseline found at {baseline_path}, validating...")
-            try:
-                report = get_valid_report(
-                    val_pregold_path=str(baseline_path),
-                    val_postgold_path=str(output_path),
-                    instance=instance
-                )
-                
-                report_path.write_text(json.dumps(report, indent=4))
-                print(f"Saved report to {report_path}")
-                
-                if len(report.get("PASS_TO_FAIL", [])) > 0:
-                    result_summary["valid"] = True
-                    print("Validation SUCCESS: Found PASS_TO_FAIL")
-                else:
-                    print("Validation result: No PASS_TO_FAIL")
-                    
-            except Exception as e:
-                print(f"Validation error: {e}")
-                result_summary["error"] = f"Grading error: {str(e)}"
-        else:
-            print(f"Baseline NOT found at {baseline_path}")
-            result_summary["error"] = "Baseline not found"
-            
-        # Output result as JSON marked with special tags
-        print(f"\n<<RESULT_JSON>>{json.dumps(result_summary)}<<RESULT_JSON>>")
-        
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        # Fallback error result
-        res = {"valid": False, "error": str(e)}
-        print(f"\n<<RESULT_JSON>>{json.dumps(res)}<<RESULT_JSON>>")
+# Lazily-built {base class name: ["owner/repo", ...]} index. One pass over
+# the registry classifies every profile for all languages at once; lookups
+# after that are O(1) with no MRO walks.
+_lang_index: dict[str, list[str]] | None = None
 
-if __name__ == "__main__":
-    main()
-"""
 
-# ============================================================================
-# Profile & Repo Utilities
-# ============================================================================
+def _build_lang_index() -> dict[str, list[str]]:
+    from swesmith.profiles import registry
+
+    wanted = frozenset(LANGUAGE_TO_BASE_CLASS.values())
+    index: dict[str, list[str]] = {name: [] for name in wanted}
+    for profile in registry.values():
+        cls = profile.__class__
+        for base in cls.__mro__:
+            if base.__name__ in wanted and base is not cls:
+                index[base.__name__].append(f"{profile.owner}/{profile.repo}")
+                break
+    return index
 
 
 def get_repos_for_language(language: str) -> list[str]:
-    """Get all registered repos for a given language."""
-    from swesmith.profiles import registry
+    """Get all registered repos for a given language (O(1) indexed lookup)."""
+    global _lang_index
 
-    base_class_name = LANGUAGE_TO_BASE_CLASS.get(language.lower())
-    if not base_class_name:
+    if language.lower() not in _SUPPORTED_LANGUAGES:
         raise ValueError(
-            f"Unknown language: {language}. Supported: {list(LANGUAGE_TO_BASE_CLASS.keys())}"
+            f"Unknown language: {language}. Supported: {sorted(_SUPPORTED_LANGUAGES)}"
         )
+    if _lang_index is None:
+        _lang_index = _build_lang_index()
+    return _lang_index[LANGUAGE_TO_BASE_CLASS[language.lower()]]
 
-    return [
-        f"{profile.owner}/{profile.repo}"
-        for profile in registry.values()
-        if profile.__class__.__name__ != base_class_name
-        and base_class_name in [base.__name__ for base in profile.__class__.__mro__]
-    ]
+
+# Lazily-built reverse index for the resolve_profile fallback path:
+# registry keys are repo/mirror names, but callers pass "owner/repo"
+_repo_index: dict | None = None
+
+
+def _build_repo_index() -> dict:
+    """Build the one-time {"owner/repo": profile} index from the registry.
+
+    One registry.values() pass — never keys() + get(), which would
+    re-instantiate a profile per key (Registry.get constructs on lookup).
+    """
+    from swesmith.profiles import registry
+
+    return {f"{p.owner}/{p.repo}": p for p in registry.values()}
 
 
+@functools.lru_cache(maxsize=None)
 def resolve_profile(repo_name: str):
-    """Resolve a profile from repo name using robust lookup."""
+    """Resolve a profile from repo name using robust lookup (memoized)."""
+    global _repo_index
     from swesmith.profiles import registry
 
     try:
         return registry.get(repo_name)
     except KeyError:
-        for key in registry.keys():
-            try:
-                p = registry.get(key)
-                if f"{p.owner}/{p.repo}" == repo_name:
-                    return p
-            except Exception:
-                continue
+        if _repo_index is None:
+            _repo_index = _build_repo_index()
+        profile = _repo_index.get(repo_name)
+        if profile is not None:
+            return profile
     raise RuntimeError(f"No profile found for repo: {repo_name}")
 
 
@@ -313,6 +321,7 @@ def _create_validator_image(image_name: str) -> modal.Image:
         )
         .env({"PYTHONPATH": "/root"})
         .add_local_dir("swesmith", remote_path="/root/swesmith")
+        .add_local_file("scripts/_remote_validator.py", VALIDATOR_IMAGE_PATH)
     )
 
 
@@ -328,7 +337,7 @@ def get_validator_image(image_name: str) -> modal.Image:
         f"DEBUG: get_validator_image called for {image_name} (not cached, building...)"
     )
     image = _create_validator_image(image_name)
-    _validator_image_cache[image_name] = image
+    _validator_image_cache[sys.intern(image_name)] = image
     return image
 
 
@@ -345,12 +354,13 @@ async def prebuild_validator_images_async(
     """
     global _validator_image_cache
 
-    # Collect unique image names
-    unique_images = set()
-    for repo, info in repos_with_patches.items():
-        profile = info["profile"]
-        if hasattr(profile, "image_name") and profile.image_name:
-            unique_images.add(profile.image_name)
+    # Collect unique image names; interned so later cache lookups compare by
+    # string identity
+    unique_images = {
+        sys.intern(info["profile"].image_name)
+        for info in repos_with_patches.values()
+        if getattr(info["profile"], "image_name", None)
+    }
 
     print(f"\n{'=' * 60}")
     print(f"PRE-BUILDING VALIDATOR IMAGES ({len(unique_images)} unique images)")
@@ -371,25 +381,29 @@ async def prebuild_validator_images_async(
     for img_name in to_build:
         _validator_image_cache[img_name] = _create_validator_image(img_name)
 
-    # Now run warmup sandboxes to force Modal to build all images
+    # Now force Modal to build all images. Prefer the eager build RPC —
+    # a warmup sandbox pays scheduling + container-start latency just to
+    # trigger the same build.
     async def warmup_all():
-        semaphore = asyncio.Semaphore(100)  # Limit concurrent builds
+        semaphore = asyncio.Semaphore(50)  # The build service is the bottleneck
 
         async def warmup_image(img_name: str) -> tuple[str, bool, str]:
-            """Run a simple command to force image build."""
+            """Ensure an image is built, without running anything in it."""
             async with semaphore:
                 try:
-                    # Rate limit sandbox creation
-                    await _sandbox_rate_limiter.acquire()
-
                     print(f"  Building: {img_name}...")
                     image = _validator_image_cache[img_name]
-                    sb = await modal.Sandbox.create.aio(
-                        app=app, image=image, timeout=300
-                    )
-                    process = await sb.exec.aio("echo", "warmup_ok")
-                    output = await process.stdout.read.aio()
-                    await sb.terminate.aio()
+                    build = getattr(image, "build", None)
+                    if build is not None:
+                        await build.aio(app)
+                    else:
+                        # Older client: creating (and immediately terminating)
+                        # a sandbox still forces the build — no exec needed.
+                        await _sandbox_rate_limiter.acquire()
+                        sb = await modal.Sandbox.create.aio(
+                            app=app, image=image, timeout=60
+                        )
+                        await sb.terminate.aio()
                     print(f"  ✓ Built: {img_name}")
                     return (img_name, True, "")
                 except Exception as e:
@@ -423,46 +437,154 @@ logs_volume = modal.Volume.from_name(VOLUME_NAME, create_if_missing=True, versio
 LOGS_MOUNT_PATH = "/logs"  # Where the volume is mounted in Modal containers
 
 
+# ============================================================================
+# Remote Grading
+# ============================================================================
+
+# Lightweight image for grading only: needs swesmith + the 'validate' extras,
+# not the per-repo Docker images the test sandboxes run in
+grader_image = (
+    modal.Image.from_registry("ubuntu:22.04", add_python="3.11")
+    .pip_install_from_pyproject("pyproject.toml", optional_dependencies=["validate"])
+    .env({"PYTHONPATH": "/root"})
+    .add_local_dir("swesmith", remote_path="/root/swesmith")
+)
+
+
+@app.function(
+    image=grader_image,
+    timeout=MODAL_TIMEOUT,
+    volumes={LOGS_MOUNT_PATH: logs_volume},
+)
+def grade_remote(
+    baseline_path: str, output_path: str, report_path: str, instance: dict
+) -> dict:
+    """Grade one validation run against its baseline.
+
+    Lives in a long-lived Modal function so swesmith.harness.grading (and its
+    heavy transitive imports) load once per container instead of once per
+    sandbox validation.
+    """
+    if "/root" not in sys.path:
+        sys.path.append("/root")
+
+    from swesmith.harness.grading import get_valid_report
+
+    result = {
+        "instance_id": instance.get("instance_id"),
+        "valid": False,
+        "error": None,
+    }
+
+    if not Path(baseline_path).exists():
+        print(f"Baseline NOT found at {baseline_path}")
+        result["error"] = "Baseline not found"
+        return result
+
+    try:
+        report = get_valid_report(
+            val_pregold_path=baseline_path,
+            val_postgold_path=output_path,
+            instance=instance,
+        )
+
+        report_file = Path(report_path)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(report, indent=4))
+        print(f"Saved report to {report_path}")
+
+        if len(report.get("PASS_TO_FAIL", [])) > 0:
+            result["valid"] = True
+            print("Validation SUCCESS: Found PASS_TO_FAIL")
+        else:
+            print("Validation result: No PASS_TO_FAIL")
+
+        logs_volume.commit()
+    except Exception as e:
+        print(f"Validation error: {e}")
+        result["error"] = f"Grading error: {e}"
+
+    return result
+
+
 # ============================================================================
 # Volume I/O Helpers
 # ============================================================================
 
 
-async def volume_write_text(path: str, content: str) -> None:
-    """Write text content to a path on the Modal Volume."""
-    import io
+class VolumeWriteBatch:
+    """Aggregate many small volume writes into one batch_upload.
 
-    def _write():
-        with logs_volume.batch_upload() as batch:
-            batch.put_file(io.BytesIO(content.encode("utf-8")), path)
+    Opening a batch per file (what volume_write_text does) pays the
+    batch-open/commit overhead once per file; queue puts here and flush once
+    to amortize it across all of them.
+    """
 
-    await asyncio.to_thread(_write)
+    def __init__(self):
+        self._puts: list[tuple[str, bytes]] = []
 
+    def put_text(self, path: str, content: str) -> "VolumeWriteBatch":
+        self._puts.append((path, content.encode("utf-8")))
+        return self
 
-async def volume_write_bytes(path: str, content: bytes) -> None:
-    """Write binary content to a path on the Modal Volume."""
-    import io
+    def put_bytes(self, path: str, content: bytes) -> "VolumeWriteBatch":
+        self._puts.append((path, content))
+        return self
 
-    def _write():
-        with logs_volume.batch_upload() as batch:
-            batch.put_file(io.BytesIO(content), path)
+    async def flush(self) -> None:
+        """Upload all queued files in a single batch."""
+        if not self._puts:
+            return
+        puts, self._puts = self._puts, []
 
-    await asyncio.to_thread(_write)
+        def _write():
+            with logs_volume.batch_upload() as batch:
+                for path, content in puts:
+                    batch.put_file(io.BytesIO(content), path)
 
+        await asyncio.to_thread(_write)
 
-async def volume_read_text(path: str) -> str | None:
-    """Read text content from the Modal Volume. Returns None if file doesn't exist."""
+
+async def volume_write_text(path: str, content: str) -> None:
+    """Write text content to a path on the Modal Volume."""
+    await VolumeWriteBatch().put_text(path, content).flush()
+
+
+async def volume_write_bytes(path: str, content: bytes) -> None:
+    """Write binary content to a path on the Modal Volume."""
+    await VolumeWriteBatch().put_bytes(path, content).flush()
+
+
+async def volume_read_bytes(path: str) -> bytes | None:
+    """Read raw content from the Modal Volume. Returns None if file doesn't exist."""
     try:
         chunks = []
         async for chunk in logs_volume.read_file.aio(path):
             chunks.append(chunk)
-        return b"".join(chunks).decode("utf-8")
+        return b"".join(chunks)
     except Exception:
         return None
 
 
+async def volume_read_text(path: str) -> str | None:
+    """Read text content from the Modal Volume. Returns None if file doesn't exist."""
+    content = await volume_read_bytes(path)
+    return content.decode("utf-8") if content is not None else None
+
+
 async def volume_file_exists(path: str) -> bool:
     """Check if a file exists on the Modal Volume."""
+    # Prefer a single-path metadata call when the client exposes one;
+    # listdir fetches the whole directory entry set.
+    stat = getattr(logs_volume, "stat", None)
+    if stat is not None:
+        try:
+            await stat.aio(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception:
+            pass  # fall through to listdir
     try:
         # listdir is much faster than reading the file as it only fetches metadata
         await logs_volume.listdir.aio(path)
@@ -480,6 +602,35 @@ async def volume_list_dir(path: str) -> list[str]:
         return []
 
 
+async def snapshot_volume_tree(prefix: str) -> set[str]:
+    """Snapshot all paths under a volume prefix with one recursive listdir.
+
+    Lets callers answer many existence questions in memory instead of one
+    listdir RPC per file. Returns an empty set when the prefix doesn't exist
+    (matching volume_file_exists semantics for missing paths).
+    """
+    try:
+        entries = await logs_volume.listdir.aio(prefix, recursive=True)
+        return {e.path for e in entries}
+    except TypeError:
+        # Older client without recursive support: breadth-first walk
+        paths: set[str] = set()
+        queue = [prefix]
+        while queue:
+            current = queue.pop()
+            try:
+                entries = await logs_volume.listdir.aio(current)
+            except Exception:
+                continue  # files raise here; they're already in `paths`
+            for entry in entries:
+                if entry.path not in paths:
+                    paths.add(entry.path)
+                    queue.append(entry.path)
+        return paths
+    except Exception:
+        return set()
+
+
 # ============================================================================
 # Rate Limiter for Sandbox Creation
 # ============================================================================
@@ -493,24 +644,129 @@ class AsyncRateLimiter:
         self.rate = rate
         self.interval = 1.0 / rate  # Time between operations
         self._lock = asyncio.Lock()
-        self._last_time = 0.0
+        self._next_slot = 0.0
 
     async def acquire(self):
-        """Wait until rate limit allows another operation."""
-        async with self._lock:
-            import time
+        """Wait until rate limit allows another operation.
 
-            now = time.monotonic()
-            wait_time = self._last_time + self.interval - now
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-                now = time.monotonic()
-            self._last_time = now
+        Each caller claims the next dispatch slot under the lock (O(ns)) and
+        sleeps *outside* it, so N concurrent acquirers get staggered wakeups
+        at `rate`/s instead of serially chaining behind one sleeper.
+        """
+        async with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+        wait_time = slot - time.monotonic()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
 
 
 # Global rate limiter for sandbox creation (Modal limit: 5/s)
 _sandbox_rate_limiter = AsyncRateLimiter(SANDBOX_RATE_LIMIT)
 
+# Background sandbox reaper: terminate RPCs run as fire-and-forget tasks so
+# validation slots free up without waiting on teardown. Tasks keep a strong
+# reference here until done; drain before the driver exits.
+_pending_terminations: set[asyncio.Task] = set()
+
+
+def _terminate_sandbox_later(sb) -> None:
+    """Terminate a sandbox off the critical path."""
+
+    async def _terminate_quietly():
+        try:
+            await sb.terminate.aio()
+        except Exception:
+            pass  # Ignore errors during cleanup
+
+    task = asyncio.create_task(_terminate_quietly())
+    _pending_terminations.add(task)
+    task.add_done_callback(_pending_terminations.discard)
+
+
+async def drain_pending_terminations() -> None:
+    """Wait for all in-flight sandbox terminations (call at shutdown)."""
+    if _pending_terminations:
+        await asyncio.gather(*_pending_terminations, return_exceptions=True)
+
+
+async def _as_completed_window(coros, window: int = MAX_PENDING_TASKS):
+    """as_completed with a bounded task window.
+
+    Instantiates at most `window` Tasks at a time from the (lazy) coroutine
+    iterable and yields results in completion order, so the pending-task
+    graph stays constant-size no matter how much work is queued behind it.
+    """
+    pending: set[asyncio.Task] = set()
+    it = iter(coros)
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < window:
+            try:
+                pending.add(asyncio.ensure_future(next(it)))
+            except StopIteration:
+                exhausted = True
+        if not pending:
+            return
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
+
+
+# Error reports are informational, so their volume writes run off the
+# critical path too: the completion loops keep consuming results instead of
+# stalling one RTT per failure. Same strong-reference pattern as the reaper.
+_pending_writes: set[asyncio.Task] = set()
+
+
+def _schedule_volume_write(path: str, content: str) -> None:
+    """Write a volume file in the background (for non-critical writes)."""
+
+    async def _write_quietly():
+        try:
+            await volume_write_text(path, content)
+        except Exception as e:
+            print(f"Background write to {path} failed: {e}")
+
+    task = asyncio.create_task(_write_quietly())
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def drain_pending_writes() -> None:
+    """Wait for all in-flight background writes (call at phase end)."""
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
+
+
+# Buffered progress logging: per-completion print() calls each pay a stdout
+# syscall, which adds up when thousands of completions land in bursts.
+# Lines accumulate here and flush as one write every ~0.5s or 50 lines
+# (same batching scheme as run_generation_phase's progress flushing).
+_log_buf: list[str] = []
+_log_last_flush = 0.0
+_LOG_FLUSH_LINES = 50
+_LOG_FLUSH_SECS = 0.5
+
+
+def _flush_log() -> None:
+    global _log_last_flush
+    if _log_buf:
+        sys.stdout.write("".join(_log_buf))
+        sys.stdout.flush()
+        _log_buf.clear()
+    _log_last_flush = time.monotonic()
+
+
+def _log_line(line: str) -> None:
+    """Queue a progress line; flushed in batches to amortize stdout writes."""
+    _log_buf.append(line + "\n")
+    if (
+        len(_log_buf) >= _LOG_FLUSH_LINES
+        or time.monotonic() - _log_last_flush >= _LOG_FLUSH_SECS
+    ):
+        _flush_log()
+
 
 # ============================================================================
 # Remote Bug Generation
@@ -537,9 +793,6 @@ def generate_bugs_remote(
     Results are saved directly to the Modal Volume, reducing data transfer.
     Returns only a lightweight summary.
     """
-    import sys
-    from io import StringIO
-
     if "/root" not in sys.path:
         sys.path.append("/root")
 
@@ -547,26 +800,7 @@ def generate_bugs_remote(
     from swesmith.bug_gen.procedural.generate import main as generate_main
     from swesmith.bug_gen.collect_patches import main as collect_patches_main
 
-    # Setup output capture
-    log_buffer = StringIO()
-    original_stdout, original_stderr = sys.stdout, sys.stderr
-
-    class TeeWriter:
-        def __init__(self, buffer, original):
-            self.buffer, self.original = buffer, original
-
-        def write(self, data):
-            self.buffer.write(data)
-            self.original.write(data)
-
-        def flush(self):
-            self.buffer.flush()
-            self.original.flush()
-
-    sys.stdout = TeeWriter(log_buffer, original_stdout)
-    sys.stderr = TeeWriter(log_buffer, original_stderr)
-
-    # Resolve repo ID
+    # Resolve repo ID (before log capture so the volume log path is known)
     def resolve_repo_id():
         try:
             return registry.get_from_inst(
@@ -586,9 +820,35 @@ def generate_bugs_remote(
     volume_base = Path(LOGS_MOUNT_PATH)
     volume_bug_dir = volume_base / language / "bug_gen" / repo_id
 
-    def _safe_execute(func, error_msg, *args, **kwargs):
-        import traceback
+    # Setup output capture at the fd level: stdout/stderr are redirected
+    # into a pipe whose reader thread tees raw bytes to the volume log and
+    # the worker's real console. Compared to a Python TeeWriter this moves
+    # the per-write cost into C/kernel and also captures subprocess output.
+    volume_bug_dir.mkdir(parents=True, exist_ok=True)
+    log_file = open(volume_bug_dir / "modal_output.log", "wb", buffering=64 * 1024)
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_out_fd = os.dup(1)
+    saved_err_fd = os.dup(2)
+    pipe_read_fd, pipe_write_fd = os.pipe()
+
+    def _tee_pipe():
+        while True:
+            chunk = os.read(pipe_read_fd, 64 * 1024)
+            if not chunk:
+                break
+            log_file.write(chunk)
+            os.write(saved_out_fd, chunk)
+        os.close(pipe_read_fd)
+
+    tee_thread = threading.Thread(target=_tee_pipe, daemon=True)
+    tee_thread.start()
+    os.dup2(pipe_write_fd, 1)
+    os.dup2(pipe_write_fd, 2)
+    os.close(pipe_write_fd)
 
+    def _safe_execute(func, error_msg, *args, **kwargs):
         try:
             return func(*args, **kwargs)
         except Exception as e:
@@ -602,14 +862,18 @@ def generate_bugs_remote(
             print(f"LOGS BASE MISSING: {logs_base}")
             return {"error": f"Logs directory {logs_base} does not exist."}
 
-        generated_dirs = [d for d in logs_base.iterdir() if d.is_dir()]
+        entries = list(logs_base.iterdir())
+        generated_dirs = [d for d in entries if d.is_dir()]
         if not generated_dirs:
-            print(f"NO DATA IN LOGS BASE. Files: {list(logs_base.glob('**/*'))}")
+            print(f"NO DATA IN LOGS BASE. Files: {entries}")
             return {"error": "No data generated"}
 
-        repo_id_actual = sorted(
-            generated_dirs, key=lambda x: x.stat().st_mtime, reverse=True
-        )[0].name
+        # Fast path: the expected repo_id dir exists; otherwise take the most
+        # recently modified dir (max is O(N), no need to sort the lot)
+        if (logs_base / repo_id).is_dir():
+            repo_id_actual = repo_id
+        else:
+            repo_id_actual = max(generated_dirs, key=lambda x: x.stat().st_mtime).name
         print(f"Detected repo_id_actual: {repo_id_actual}")
 
         _safe_execute(
@@ -621,14 +885,19 @@ def generate_bugs_remote(
         # Ensure volume directory exists
         volume_bug_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create and save zip
+        # Create and save zip: write straight to the volume in one pass.
+        # ZIP_STORED skips deflate — the contents are small diffs and JSON,
+        # not worth the CPU — and avoids the /tmp round-trip + copy that
+        # shutil.make_archive needed.
         def _save_zip():
-            shutil.make_archive(
-                f"/tmp/{repo_id_actual}", "zip", str(logs_base / repo_id_actual)
-            )
-            zip_path = f"/tmp/{repo_id_actual}.zip"
+            import zipfile
+
+            bug_root = logs_base / repo_id_actual
             dest_path = volume_bug_dir / "bugs.zip"
-            shutil.copy(zip_path, dest_path)
+            with zipfile.ZipFile(dest_path, "w", zipfile.ZIP_STORED) as zf:
+                for p in sorted(bug_root.rglob("*")):
+                    if p.is_file():
+                        zf.write(p, p.relative_to(bug_root))
             print(f"Saved bugs.zip to volume: {dest_path}")
 
         _safe_execute(_save_zip, "Error saving zip to volume")
@@ -637,7 +906,7 @@ def generate_bugs_remote(
         patches_file = logs_base / f"{repo_id_actual}_all_patches.json"
         if patches_file.exists():
             patches_json = patches_file.read_text()
-            patches = json.loads(patches_json)
+            patches = _json_loads(patches_json)
 
             # Save patches to volume
             patches_dest = (
@@ -653,18 +922,17 @@ def generate_bugs_remote(
                 )
                 return {"total_bugs": 0, "patches": []}
 
-            # Mark as done
+            # Mark as done (the finally block commits the volume once for
+            # all of this run's writes)
             (volume_bug_dir / "done.txt").write_text(
                 f"Generation completed: {len(patches)} bugs generated"
             )
-            logs_volume.commit()  # Force internal commit to persist done.txt immediately
             return {"total_bugs": len(patches), "patches": patches}
         else:
             print(
                 f"Patches file not found. Available: {[p.name for p in logs_base.iterdir()]}"
             )
             (volume_bug_dir / "error.txt").write_text("No patches_json generated")
-            logs_volume.commit()
             return {"error": "No patches_json generated"}
 
     soft_timeout = MODAL_TIMEOUT - timeout_buffer_seconds
@@ -683,12 +951,18 @@ def generate_bugs_remote(
             timeout_seconds=soft_timeout,
         )
     except Exception as e:
-        import traceback
-
         print(f"Error in generate_main: {e}")
         traceback.print_exc()
     finally:
-        sys.stdout, sys.stderr = original_stdout, original_stderr
+        # Restore the real fds; closing the last pipe-write dup EOFs the tee
+        # thread, which drains remaining bytes into the log before exiting
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_out_fd, 1)
+        os.dup2(saved_err_fd, 2)
+        tee_thread.join(timeout=10)
+        os.close(saved_out_fd)
+        os.close(saved_err_fd)
         print("\nCollecting and saving results to volume...")
 
         collection_result = _safe_execute(
@@ -699,13 +973,11 @@ def generate_bugs_remote(
         else:
             result["error"] = "Failed to collect results"
 
-        # Save log to volume
-        log_content = log_buffer.getvalue()
+        # Close the streamed log (flushes any buffered tail to the volume)
         try:
-            volume_bug_dir.mkdir(parents=True, exist_ok=True)
-            (volume_bug_dir / "modal_output.log").write_text(log_content)
+            log_file.close()
         except Exception as e:
-            print(f"Failed to save log: {e}")
+            print(f"Failed to close log: {e}")
 
         # If there was an error, write error file
         if "error" in result:
@@ -725,6 +997,45 @@ def generate_bugs_remote(
 # ============================================================================
 # Validation Sandbox
 # ============================================================================
+
+
+# Static script fragments: formatted once and reused across the thousands of
+# sandbox invocations of a validation run
+@functools.lru_cache(maxsize=256)
+def _script_prefix(workdir: str) -> str:
+    """Shared script header for a given workdir (one per repo in practice)."""
+    return "\n".join(
+        [
+            "#!/bin/bash",
+            "exec 2>&1",
+            "set -uxo pipefail",
+            f"cd {workdir}",
+            "git checkout .",
+        ]
+    )
+
+
+async def _upload_sandbox_script(
+    sb: modal.Sandbox, script_content: str, path: str = "/tmp/run.sh"
+) -> None:
+    """Upload the run script to the sandbox filesystem (more robust than stdin)."""
+    f = await sb.open.aio(path, "w")
+    await f.write.aio(script_content)
+    await f.close.aio()
+
+
+@functools.lru_cache(maxsize=256)
+def _pregold_tail(test_cmd: str) -> str:
+    """Marker-wrapped test invocation for pregold runs (one per test_cmd)."""
+    return "\n".join(
+        [
+            f": '{TEST_OUTPUT_START}'",
+            f"{test_cmd} || true",
+            f": '{TEST_OUTPUT_END}'",
+        ]
+    )
+
+
 async def run_validation_in_sandbox(
     semaphore: asyncio.Semaphore,
     app: modal.App,
@@ -734,26 +1045,20 @@ async def run_validation_in_sandbox(
     workdir: str,
     patch: str | None,
     timeout: int,
-    postgold_config: dict | None = None,
 ) -> dict:
     """
     Run validation in a Modal Sandbox with a specific Docker image.
 
-    If postgold_config is provided, runs the remote validator script and returns
-    summary metadata. Results are written directly to the volume.
-
-    If postgold_config is None, runs generic test cmd and returns output.
+    Runs the marker-wrapped test cmd (pregold mode) and returns its output
+    and exit code. Post-gold validation goes through
+    run_validation_batch_in_sandbox instead.
     """
     async with semaphore:
         # print(f"[{instance_id}] Getting validator image ({image_name})...")
         validator_image = get_validator_image(image_name)
 
         script_lines = [
-            "#!/bin/bash",
-            "exec 2>&1",
-            "set -uxo pipefail",
-            f"cd {workdir}",
-            "git checkout .",
+            _script_prefix(workdir),
         ]
 
         if patch:
@@ -773,40 +1078,13 @@ async def run_validation_in_sandbox(
             "timeout": timeout,
         }
 
-        if postgold_config:
-            # Mount logs volume for direct writing
-            sandbox_kwargs["volumes"] = {LOGS_MOUNT_PATH: logs_volume}
-
-            # Write config and validator script
-            config_json = json.dumps(postgold_config)
-            script_lines.extend(
-                [
-                    "cat > /tmp/config.json << 'CONFIG_EOF'",
-                    config_json,
-                    "CONFIG_EOF",
-                    "cat > /tmp/validator.py << 'SCRIPT_EOF'",
-                    REMOTE_VALIDATOR_SCRIPT,
-                    "SCRIPT_EOF",
-                    "python3 /tmp/validator.py /tmp/config.json",
-                ]
-            )
-        else:
-            # Legacy/Pregold mode: just run test
-            script_lines.extend(
-                [
-                    f": '{TEST_OUTPUT_START}'",
-                    f"{test_cmd} || true",
-                    f": '{TEST_OUTPUT_END}'",
-                ]
-            )
+        script_lines.append(_pregold_tail(test_cmd))
 
         sb = None
         sandbox_id = None  # Track sandbox ID for debugging
         current_step = "init"  # Track current step for error reporting
 
         # Debug logging helper
-        import time
-
         debug_sandbox = True  # Set to True to enable detailed sandbox logging
 
         def _log(step: str, msg: str = ""):
@@ -832,16 +1110,11 @@ async def run_validation_in_sandbox(
             _log("create_sandbox", f"created (sandbox_id={sandbox_id})")
 
             # Write script to file directly using sandbox.open() to avoid ARG_MAX limit
+            # The patch rides inside the script as a heredoc, so this single
+            # upload is the only per-sandbox file transfer.
             script_content = "\n".join(script_lines)
-            script_size = len(script_content)
-
-            # Write script file directly to sandbox filesystem (more robust than stdin)
-            _log("write_script", f"opening /tmp/run.sh ({script_size} bytes)")
-            f = await sb.open.aio("/tmp/run.sh", "w")
-            _log("write_script", "writing content")
-            await f.write.aio(script_content)
-            _log("write_script", "closing file")
-            await f.close.aio()
+            _log("write_script", f"uploading /tmp/run.sh ({len(script_content)} bytes)")
+            await _upload_sandbox_script(sb, script_content)
             _log("write_script", "done")
 
             # Execute the script
@@ -849,55 +1122,28 @@ async def run_validation_in_sandbox(
             process = await sb.exec.aio("bash", "/tmp/run.sh")
             _log("exec_script", "process started")
 
-            _log("read_stdout", "reading...")
-            output_raw = await process.stdout.read.aio()
-            output_size = len(output_raw) if output_raw else 0
-            _log("read_stdout", f"done ({output_size} bytes)")
+            _log("read_stdout", "streaming...")
+            # Stream stdout instead of buffering the whole run in one read,
+            # so decoding overlaps with sandbox execution
+            chunks: list[str] = []
+            output_size = 0
+            async for chunk in process.stdout:
+                if isinstance(chunk, bytes):
+                    chunk = chunk.decode("utf-8", errors="replace")
+                output_size += len(chunk)
+                chunks.append(chunk)
+            output = "".join(chunks)
+            _log("read_stdout", f"done ({output_size} chars)")
 
             _log("wait_exit", "waiting for exit code...")
             exit_code = await process.wait.aio()
             _log("wait_exit", f"exit_code={exit_code}")
-            output = (
-                output_raw.decode("utf-8", errors="replace")
-                if isinstance(output_raw, bytes)
-                else output_raw
-            )
-            # print(f'{output=}')
 
-            if postgold_config:
-                # Parse JSON result from output
-                if "<<RESULT_JSON>>" in output:
-                    try:
-                        json_str = output.split("<<RESULT_JSON>>")[1]
-                        result = json.loads(json_str)
-                        # Ensure error is propagated if script failed but printed JSON
-                        if result.get("exit_code", 0) != 0 and not result.get("error"):
-                            # This usually shouldn't happen with our script unless test failed (which is normal)
-                            # But let's trust the 'valid' flag and 'error' field
-                            pass
-                        return result
-                    except Exception as e:
-                        return {
-                            "instance_id": instance_id,
-                            "error": f"Failed to parse remote result: {e}",
-                            "raw_output": output,
-                            "step": current_step,
-                            "sandbox_id": sandbox_id,
-                        }
-                else:
-                    return {
-                        "instance_id": instance_id,
-                        "error": "No remote result found",
-                        "raw_output": output,
-                        "step": current_step,
-                        "sandbox_id": sandbox_id,
-                    }
-            else:
-                return {
-                    "instance_id": instance_id,
-                    "output": output,
-                    "exit_code": exit_code,
-                }
+            return {
+                "instance_id": instance_id,
+                "output": output,
+                "exit_code": exit_code,
+            }
         except Exception as e:
             err_str = str(e)
             _log("exception", f"ERROR: {err_str[:200]}")
@@ -908,12 +1154,135 @@ async def run_validation_in_sandbox(
                 "sandbox_id": sandbox_id,
             }
         finally:
-            # Always terminate sandbox to prevent zombie connections
+            # Always terminate sandbox to prevent zombie connections; hand
+            # the RPC to a background reaper so this semaphore slot frees up
+            # without waiting on teardown
             if sb is not None:
+                _terminate_sandbox_later(sb)
+
+
+_RESULT_JSON_RE = re.compile(r"<<RESULT_JSON>>(.*?)<<RESULT_JSON>>", re.DOTALL)
+
+# Patch count recorded by generation workers in done.txt
+_DONE_RE = re.compile(r"completed: (\d+) bugs")
+
+# Trailing ".<8-hex-char commit hash>" on repo ids, e.g. "owner__repo.3ec3512d"
+_COMMIT_HASH_RE = re.compile(r"\.[a-f0-9]{8}$")
+
+# All diagnostic needles for failed pregold output in one alternation, so a
+# multi-MB log is scanned once instead of once per substring check
+_PREGOLD_DIAG_RE = re.compile(
+    "|".join(
+        re.escape(needle)
+        for needle in (
+            "APPLY_PATCH_FAIL",
+            "error: patch failed",
+            TEST_OUTPUT_START,
+            TEST_OUTPUT_END,
+        )
+    )
+)
+
+
+async def run_validation_batch_in_sandbox(
+    semaphore: asyncio.Semaphore,
+    app: modal.App,
+    image_name: str,
+    workdir: str,
+    batch: list[dict],
+    timeout: int,
+) -> dict[str, dict]:
+    """Validate several patches of one repo inside a single sandbox.
+
+    The sandbox loops `git reset --hard; git apply; validator` per patch so
+    sandbox creation, image pull and script upload are amortized across the
+    batch instead of paid once per patch. Each batch item needs instance_id,
+    patch, test_cmd and output_path; the validator writes test output to the
+    mounted volume as usual. Returns {instance_id: raw validator result};
+    grading stays host-side with the caller. A "__error__" key carries any
+    batch-level failure.
+    """
+    async with semaphore:
+        validator_image = get_validator_image(image_name)
+
+        script_lines = [_script_prefix(workdir)]
+        # Stage all patch diffs and validator configs up front...
+        for i, item in enumerate(batch):
+            config_json = _json_dumps(
+                {
+                    "test_cmd": item["test_cmd"],
+                    "output_path": item["output_path"],
+                    "instance": {"instance_id": item["instance_id"]},
+                }
+            )
+            script_lines.extend(
+                [
+                    f"cat > /tmp/config_{i}.json << 'CONFIG_EOF'",
+                    config_json,
+                    "CONFIG_EOF",
+                    f"cat > /tmp/patch_{i}.diff << 'PATCH_EOF'",
+                    item["patch"],
+                    "PATCH_EOF",
+                ]
+            )
+        # ...then run them back to back, resetting the tree between patches
+        for i, item in enumerate(batch):
+            apply_failed = json.dumps(
+                {
+                    "instance_id": item["instance_id"],
+                    "valid": False,
+                    "error": "git apply failed",
+                }
+            )
+            script_lines.extend(
+                [
+                    "git reset --hard HEAD",
+                    # reset alone leaves untracked files (new files from a
+                    # previous patch, test artifacts) to leak into later items;
+                    # no -x so ignored dirs like node_modules match the image
+                    "git clean -fd",
+                    f"if git apply /tmp/patch_{i}.diff; then",
+                    f"    python3 -OO {VALIDATOR_IMAGE_PATH} /tmp/config_{i}.json",
+                    "else",
+                    f"    echo '<<RESULT_JSON>>{apply_failed}<<RESULT_JSON>>'",
+                    "fi",
+                ]
+            )
+
+        sb = None
+        try:
+            await _sandbox_rate_limiter.acquire()
+            sb = await modal.Sandbox.create.aio(
+                app=app,
+                image=validator_image,
+                timeout=timeout,
+                volumes={LOGS_MOUNT_PATH: logs_volume},
+            )
+            await _upload_sandbox_script(sb, "\n".join(script_lines))
+            process = await sb.exec.aio("bash", "/tmp/run.sh")
+
+            chunks = []
+            async for chunk in process.stdout:
+                if isinstance(chunk, bytes):
+                    chunk = chunk.decode("utf-8", errors="replace")
+                chunks.append(chunk)
+            output = "".join(chunks)
+            await process.wait.aio()
+
+            results: dict[str, dict] = {}
+            for fragment in _RESULT_JSON_RE.findall(output):
                 try:
-                    await sb.terminate.aio()
+                    parsed = _json_loads(fragment)
                 except Exception:
-                    pass  # Ignore errors during cleanup
+                    continue  # set -x trace noise, partial line, etc.
+                if isinstance(parsed, dict) and parsed.get("instance_id"):
+                    results[parsed["instance_id"]] = parsed
+            return results
+        except Exception as e:
+            return {"__error__": {"error": str(e)[:2000]}}
+        finally:
+            if sb is not None:
+                _terminate_sandbox_later(sb)
 
 
 # ============================================================================
@@ -938,53 +1307,54 @@ async def run_generation_phase(repos: list[str], args, language: str) -> list[di
     skipped_error = 0
     failed_to_resolve = []  # Repos that failed profile resolution
 
-    # First, resolve all profiles (can be done in parallel too, but usually fast)
-    resolved_repos = []  # List of (repo, repo_id) tuples
-    for repo in repos:
+    # Resolve all profiles in parallel off the event loop; resolve_profile is
+    # memoized so repeats are free
+    def _try_resolve(repo: str) -> tuple[str, str | None, str | None]:
         try:
-            profile = resolve_profile(repo)
-            resolved_repos.append((repo, profile.repo_name))
+            return (repo, resolve_profile(repo).repo_name, None)
         except Exception as e:
+            return (repo, None, str(e))
+
+    resolve_results = await asyncio.gather(
+        *(asyncio.to_thread(_try_resolve, r) for r in repos)
+    )
+
+    resolved_repos = []  # List of (repo, repo_id) tuples
+    for repo, repo_id, err in resolve_results:
+        if err is None:
+            resolved_repos.append((repo, repo_id))
+        else:
             failed_to_resolve.append(
                 {
                     "repo": repo,
                     "repo_id": None,
-                    "error": f"Failed to resolve profile: {e}",
+                    "error": f"Failed to resolve profile: {err}",
                 }
             )
 
-    # Parallelize volume existence checks using asyncio
-    # Each repo needs 3 checks: done.txt, error.txt, patches.json
+    # One recursive snapshot answers all 3 existence checks per repo
+    # (done.txt, error.txt, patches.json) without per-file RPCs
+
+    print(
+        f"  Checking {len(resolved_repos)} repos for existing results (one volume snapshot)..."
+    )
+    snapshot = await snapshot_volume_tree(f"{language}/bug_gen")
 
-    async def check_repo_status(repo_tuple: tuple[str, str]) -> tuple[str, str, str]:
+    def check_repo_status(repo_tuple: tuple[str, str]) -> tuple[str, str, str]:
         """Check if a repo is already processed. Returns (repo, repo_id, status)."""
         repo, repo_id = repo_tuple
         volume_bug_dir = f"{language}/bug_gen/{repo_id}"
 
-        if await volume_file_exists(f"{volume_bug_dir}/done.txt"):
+        if f"{volume_bug_dir}/done.txt" in snapshot:
             return (repo, repo_id, "done")
-        elif await volume_file_exists(f"{volume_bug_dir}/error.txt"):
+        elif f"{volume_bug_dir}/error.txt" in snapshot:
             return (repo, repo_id, "error")
-        elif await volume_file_exists(f"{language}/bug_gen/{repo_id}_all_patches.json"):
+        elif f"{language}/bug_gen/{repo_id}_all_patches.json" in snapshot:
             return (repo, repo_id, "patches_exist")
         else:
             return (repo, repo_id, "pending")
 
-    print(f"  Checking {len(resolved_repos)} repos for existing results (parallel)...")
-
-    semaphore = asyncio.Semaphore(100)
-
-    async def check_with_sem(repo_tuple):
-        async with semaphore:
-            return await check_repo_status(repo_tuple)
-
-    tasks = [check_with_sem(rt) for rt in resolved_repos]
-    if tasks:
-        results = await asyncio.gather(*tasks)
-    else:
-        results = []
-
-    for repo, repo_id, status in results:
+    for repo, repo_id, status in map(check_repo_status, resolved_repos):
         if status == "done":
             print(f"  Skipping {repo}: already completed")
             skipped_done += 1
@@ -1017,8 +1387,16 @@ async def run_generation_phase(repos: list[str], args, language: str) -> list[di
     if repo_names:
         completed = 0
         total_bugs = 0
+        # Coalesce progress output: one write per 50 completions instead of
+        # one print per result, so the driver keeps draining the map stream
+        progress_lines: list[str] = []
+
+        def flush_progress():
+            if progress_lines:
+                print("\n".join(progress_lines), flush=True)
+                progress_lines.clear()
 
-        for result_or_exc in generate_bugs_remote.map(
+        async for result_or_exc in generate_bugs_remote.map.aio(
             repo_names,
             kwargs={
                 "max_bugs": args.max_bugs,
@@ -1036,26 +1414,40 @@ async def run_generation_phase(repos: list[str], args, language: str) -> list[di
                 generation_results.append(
                     {"error": f"Worker exception: {result_or_exc}"}
                 )
-                print(f"  [{completed}/{len(repo_names)}] ERROR: {result_or_exc}")
+                progress_lines.append(
+                    f"  [{completed}/{len(repo_names)}] ERROR: {result_or_exc}"
+                )
             else:
                 # Result is a dict with repo, repo_id, total_bugs/patches/error
                 generation_results.append(result_or_exc)
                 repo = result_or_exc.get("repo", "unknown")
                 if "error" in result_or_exc:
-                    print(
+                    progress_lines.append(
                         f"  [{completed}/{len(repo_names)}] {repo}: ERROR - {result_or_exc['error'][:50]}"
                     )
                 else:
                     bugs = result_or_exc.get("total_bugs", 0)
                     total_bugs += bugs
-                    print(
+                    progress_lines.append(
                         f"  [{completed}/{len(repo_names)}] {repo}: {bugs} bugs generated"
                     )
+            if len(progress_lines) >= 50:
+                flush_progress()
 
+        flush_progress()
         print(
             f"\nGeneration complete: {total_bugs} total bugs from {len(repo_names)} repos\n"
         )
 
+    # One aggregated summary write instead of driver-side per-repo bookkeeping
+    # on the volume (workers already wrote their own done/error markers)
+    try:
+        await volume_write_text(
+            f"{language}/bug_gen/_summary.json", _json_dumps(generation_results)
+        )
+    except Exception as e:
+        print(f"Warning: could not write generation summary: {e}")
+
     return generation_results
 
 
@@ -1064,23 +1456,50 @@ async def run_generation_phase(repos: list[str], args, language: str) -> list[di
 # ============================================================================
 
 
+@dataclass(slots=True)
+class RepoAnn:
+    """Per-repo metadata shared by every one of that repo's patches."""
+
+    repo: str
+    repo_id: str
+    profile: object
+    language: str
+
+
 def annotate_patches(
-    patches: list, repo: str, repo_id: str, profile, language: str
+    patches: list,
+    repo: str,
+    repo_id: str,
+    profile,
+    language: str,
+    repo_registry: dict,
 ) -> list:
-    """Add metadata to patches for validation."""
+    """Add metadata to patches for validation.
+
+    One shared RepoAnn per repo instead of four dict entries per patch:
+    cuts per-patch memory and the repeated key hashing on access. The
+    caller-owned repo_registry collects per-repo metadata in the same pass,
+    so nothing downstream has to rediscover unique repos from the patches.
+    """
+    ann = RepoAnn(repo, repo_id, profile, language)
+    repo_registry.setdefault(
+        repo, {"profile": profile, "repo_id": repo_id, "language": language}
+    )
     for p in patches:
-        p["_repo"] = repo
-        p["_repo_id"] = repo_id
-        p["_profile"] = profile
-        p["_language"] = language
+        p["_ann"] = ann
     return patches
 
 
-async def collect_patches_from_files(repos: list[str], language: str) -> list[dict]:
-    """Collect patches from Modal Volume for validate-only mode."""
-    import re
+async def collect_patches_from_files(
+    repos: list[str], language: str
+) -> tuple[list[dict], dict]:
+    """Collect patches from Modal Volume for validate-only mode.
 
+    Returns (all_patches, repo_registry) where repo_registry maps each repo
+    to its {profile, repo_id, language} metadata.
+    """
     all_patches = []
+    repo_registry: dict[str, dict] = {}
 
     # First, resolve all profiles (usually fast, local operation)
     resolved_repos = []  # List of (repo, repo_id, profile) tuples
@@ -1091,33 +1510,58 @@ async def collect_patches_from_files(repos: list[str], language: str) -> list[di
         except Exception:
             print(f"  Skipping {repo}: profile not found")
 
+    # One recursive snapshot of the bug_gen tree answers the error.txt,
+    # done.txt and patches-file existence questions for every repo locally,
+    # instead of one round-trip per probe per repo
+    bug_gen_snapshot = await snapshot_volume_tree(f"{language}/bug_gen")
+
     async def check_and_load_repo(repo_tuple: tuple) -> tuple:
         """Check repo status and load patches if valid. Returns (repo, repo_id, profile, status, patches_json)."""
         repo, repo_id, profile = repo_tuple
         bug_gen_dir = f"{language}/bug_gen/{repo_id}"
+        ref_dir = f"{language}/run_validation/{repo_id}/{repo_id}.ref"
 
-        # 1. Check if validation previously failed (broken baseline)
-        if await volume_file_exists(
-            f"{language}/run_validation/{repo_id}/{repo_id}.ref/error.txt"
-        ):
+        # 1. Check if validation previously failed (broken baseline):
+        # one listing of the .ref dir instead of a per-file probe
+        ref_files = await volume_list_dir(ref_dir)
+        if f"{ref_dir}/error.txt" in ref_files:
             return (repo, repo_id, profile, "validation_failed", None)
 
         # 2. Check if generation failed
-        if await volume_file_exists(f"{bug_gen_dir}/error.txt"):
+        if f"{bug_gen_dir}/error.txt" in bug_gen_snapshot:
             return (repo, repo_id, profile, "generation_failed", None)
 
-        # 3. Check patch count from done.txt to avoid reading large files for small repos
-        done_content = await volume_read_text(f"{bug_gen_dir}/done.txt")
-        if done_content:
-            match = re.search(r"completed: (\d+) bugs", done_content)
-            if match:
-                count = int(match.group(1))
-                if count < MIN_PATCHES_FOR_VALIDATION:
-                    return (repo, repo_id, profile, f"too_few_patches:{count}", None)
-
-        # 4. Read patches
+        # 3+4. Overlap the done.txt and patches reads instead of serializing
+        # two round-trips; the (much larger) patches read is cancelled when
+        # done.txt reports too few patches
         patches_path = f"{language}/bug_gen/{repo_id}_all_patches.json"
-        patches_json = await volume_read_text(patches_path)
+        # Bytes go straight into the JSON parser; no intermediate str decode
+        patches_task = (
+            asyncio.create_task(volume_read_bytes(patches_path))
+            if patches_path in bug_gen_snapshot
+            else None
+        )
+
+        if f"{bug_gen_dir}/done.txt" in bug_gen_snapshot:
+            done_content = await volume_read_text(f"{bug_gen_dir}/done.txt")
+            if done_content:
+                match = _DONE_RE.search(done_content)
+                if match:
+                    count = int(match.group(1))
+                    if count < MIN_PATCHES_FOR_VALIDATION:
+                        if patches_task is not None:
+                            patches_task.cancel()
+                        return (
+                            repo,
+                            repo_id,
+                            profile,
+                            f"too_few_patches:{count}",
+                            None,
+                        )
+
+        if patches_task is None:
+            return (repo, repo_id, profile, "no_patches_file", None)
+        patches_json = await patches_task
 
         if patches_json:
             return (repo, repo_id, profile, "ok", patches_json)
@@ -1126,19 +1570,14 @@ async def collect_patches_from_files(repos: list[str], language: str) -> list[di
 
     print(f"  Checking {len(resolved_repos)} repos for patches (parallel)...")
 
-    semaphore = asyncio.Semaphore(100)
-
     async def check_with_sem(rt):
-        async with semaphore:
+        async with _VOLUME_SEM:
             return await check_and_load_repo(rt)
 
-    tasks = [check_with_sem(rt) for rt in resolved_repos]
-    if tasks:
-        results = await asyncio.gather(*tasks)
-    else:
-        results = []
-
-    for repo, repo_id, profile, status, patches_json in results:
+    # Process each repo as its check lands instead of waiting for the whole
+    # fan-out: JSON parsing of fast repos overlaps the slow checks' tail
+    for coro in asyncio.as_completed([check_with_sem(rt) for rt in resolved_repos]):
+        repo, repo_id, profile, status, patches_json = await coro
         if status == "validation_failed":
             print(f"  Skipping {repo}: validation previously failed (pre-gold)")
         elif status == "generation_failed":
@@ -1151,26 +1590,33 @@ async def collect_patches_from_files(repos: list[str], language: str) -> list[di
         elif status == "no_patches_file":
             print(f"  Skipping {repo}: no patches file")
         elif status == "ok" and patches_json:
-            patches = json.loads(patches_json)
+            patches = _json_loads(patches_json)
             all_patches.extend(
-                annotate_patches(patches, repo, repo_id, profile, language)
+                annotate_patches(
+                    patches, repo, repo_id, profile, language, repo_registry
+                )
             )
             print(f"  {repo}: {len(patches)} patches")
 
-    return all_patches
+    return all_patches, repo_registry
 
 
 def collect_patches_from_generation(
     generation_results: list[dict], language: str
-) -> tuple[list[dict], list[dict]]:
-    """Collect patches from generation results, separating errors."""
+) -> tuple[list[dict], dict, list[dict]]:
+    """Collect patches from generation results, separating errors.
+
+    Returns (all_patches, repo_registry, errors).
+    """
     all_patches, errors = [], []
+    repo_registry: dict[str, dict] = {}
     for gen_result in generation_results:
         if "error" in gen_result:
             errors.append(gen_result)
             continue
         patches = gen_result.get("patches", [])
         if patches:
+            # resolve_profile is memoized, so repeated repos cost one lookup
             profile = resolve_profile(gen_result["repo"])
             all_patches.extend(
                 annotate_patches(
@@ -1179,37 +1625,26 @@ def collect_patches_from_generation(
                     gen_result["repo_id"],
                     profile,
                     language,
+                    repo_registry,
                 )
             )
-    return all_patches, errors
-
-
-def build_repos_with_patches(all_patches: list) -> dict:
-    """Build repos_with_patches dict from annotated patches."""
-    repos = {}
-    for p in all_patches:
-        repo = p["_repo"]
-        if repo not in repos:
-            repos[repo] = {
-                "profile": p["_profile"],
-                "repo_id": p["_repo_id"],
-                "language": p["_language"],
-            }
-    return repos
+    return all_patches, repo_registry, errors
 
 
 async def run_pregold_phase_async(
-    repos_with_patches: dict, max_concurrent: int, env_name: str
-) -> set[str]:
-    """Run all pre-gold (baseline) tests asynchronously. Returns set of repos with 0 passing tests (to skip)."""
-    import tempfile
-    from swesmith.harness.grading import read_test_output
+    repos_with_patches: dict, semaphore: asyncio.Semaphore, env_name: str
+) -> AsyncIterator[tuple[str, bool]]:
+    """Run all pre-gold (baseline) tests, yielding (repo, baseline_ok) per repo
+    as each baseline resolves so post-gold work can start immediately.
+
+    The semaphore is shared with post-gold to bound global sandbox
+    concurrency across the pipelined phases.
+    """
+    from swesmith.harness.grading import read_test_output_str
     from swebench.harness.constants import TestStatus
 
     print("\nPHASE: PRE-GOLD (BASELINE) TESTS")
-    print(
-        f"Running {len(repos_with_patches)} baselines, max concurrent: {max_concurrent}"
-    )
+    print(f"Running {len(repos_with_patches)} baselines")
 
     tasks = []
     previously_failed = set()  # Repos that failed in previous runs
@@ -1220,13 +1655,12 @@ async def run_pregold_phase_async(
         """Check if baseline exists or failed. Returns (repo, info, status)."""
         repo, info = repo_info_tuple
         lang = info["language"]
-        baseline_output_path = f"{lang}/run_validation/{info['repo_id']}/{info['repo_id']}.ref/test_output.txt"
-        error_path = (
-            f"{lang}/run_validation/{info['repo_id']}/{info['repo_id']}.ref/error.txt"
-        )
+        ref_dir = f"{lang}/run_validation/{info['repo_id']}/{info['repo_id']}.ref"
 
-        test_output_exists = await volume_file_exists(baseline_output_path)
-        error_exists = await volume_file_exists(error_path)
+        # One listing of the .ref dir answers both existence probes
+        ref_files = await volume_list_dir(ref_dir)
+        test_output_exists = f"{ref_dir}/test_output.txt" in ref_files
+        error_exists = f"{ref_dir}/error.txt" in ref_files
 
         if test_output_exists and not error_exists:
             return (repo, info, "exists")
@@ -1239,26 +1673,23 @@ async def run_pregold_phase_async(
         f"  Checking {len(repos_with_patches)} baselines for existing results (parallel)..."
     )
 
-    semaphore = asyncio.Semaphore(100)
-
     async def check_with_sem(item):
-        async with semaphore:
+        async with _VOLUME_SEM:
             return await check_baseline_status(item)
 
     check_tasks = [
         check_with_sem((repo, info)) for repo, info in repos_with_patches.items()
     ]
-    if check_tasks:
-        results = await asyncio.gather(*check_tasks)
-    else:
-        results = []
-
-    for repo, info, status in results:
+    # Consume checks as they complete so task building overlaps the tail
+    for coro in asyncio.as_completed(check_tasks):
+        repo, info, status = await coro
         if status == "exists":
             print(f"  Skipping {repo}: baseline exists")
+            yield (repo, True)
         elif status == "failed":
             print(f"  Skipping {repo}: previously failed")
             previously_failed.add(repo)
+            yield (repo, False)
         else:
             tasks.append(
                 {
@@ -1273,17 +1704,10 @@ async def run_pregold_phase_async(
 
     if not tasks:
         print("  All baselines already exist!\\n")
-        return previously_failed  # Return previously failed repos to skip in post-gold
+        return
 
-    # Semaphore controls max concurrent operations
-    semaphore = asyncio.Semaphore(max_concurrent)
     failed_repos = previously_failed.copy()  # Start with previously failed repos
 
-    # Install custom exception handler to log socket.send() exception details
-    loop = asyncio.get_running_loop()
-    exception_handler = setup_asyncio_exception_logging()
-    loop.set_exception_handler(exception_handler)
-
     async def process_baseline(task: dict) -> tuple[dict, dict]:
         """Process a single baseline test."""
         result = await run_validation_in_sandbox(
@@ -1298,13 +1722,14 @@ async def run_pregold_phase_async(
         )
         return (task, result)
 
-    # Create all async tasks
-    async_tasks = [process_baseline(t) for t in tasks]
-
-    # Process results as they complete
+    # Process results as they complete, instantiating coroutines lazily so
+    # the pending-task window stays bounded. Per-iteration lookups that never
+    # change are hoisted to locals: enum attribute chains cost two global
+    # lookups per use, a local costs one LOAD_FAST.
     completed = 0
-    for coro in asyncio.as_completed(async_tasks):
-        task, result = await coro
+    total = len(tasks)
+    passed_value = TestStatus.PASSED.value
+    async for task, result in _as_completed_window(map(process_baseline, tasks)):
         completed += 1
 
         lang = task["language"]
@@ -1319,43 +1744,37 @@ async def run_pregold_phase_async(
                     f"{volume_baseline_dir}/test_output.txt", result["output"]
                 )
 
-                # Validate baseline has at least 1 passing test (use temp file for parsing)
+                # Validate baseline has at least 1 passing test (parse the
+                # in-memory output directly, no tempfile round-trip)
                 try:
-                    with tempfile.NamedTemporaryFile(
-                        mode="w", suffix=".txt", delete=False
-                    ) as f:
-                        f.write(result["output"])
-                        temp_path = f.name
-                    test_output, found = read_test_output(temp_path)
-                    Path(temp_path).unlink()
+                    test_output, found = read_test_output_str(result["output"])
 
                     if found and test_output:
                         status_map = task["profile"].log_parser(test_output)
                         passed = sum(
-                            1
-                            for s in status_map.values()
-                            if s == TestStatus.PASSED.value
+                            1 for s in status_map.values() if s == passed_value
                         )
                         if passed == 0:
                             status = "⚠️ 0 tests passed (skipping post-gold)"
                             failed_repos.add(task["repo"])
-                            await volume_write_text(
+                            _schedule_volume_write(
                                 f"{volume_baseline_dir}/error.txt",
                                 "Pre-gold failed: 0 tests passed",
                             )
                         else:
                             status = f"OK ({passed} tests passed)"
                     else:
-                        # Diagnose why test output wasn't found
-                        raw_output = result["output"]
-                        if (
-                            "APPLY_PATCH_FAIL" in raw_output
-                            or "error: patch failed" in raw_output
-                        ):
+                        # Diagnose why test output wasn't found: one scan of
+                        # the raw output collects every needle hit at once
+                        hits = {
+                            m.group(0)
+                            for m in _PREGOLD_DIAG_RE.finditer(result["output"])
+                        }
+                        if "APPLY_PATCH_FAIL" in hits or "error: patch failed" in hits:
                             reason = "patch apply failed"
-                        elif TEST_OUTPUT_START not in raw_output:
+                        elif TEST_OUTPUT_START not in hits:
                             reason = "test command crashed before start marker"
-                        elif TEST_OUTPUT_END not in raw_output:
+                        elif TEST_OUTPUT_END not in hits:
                             reason = "tests never completed (no end marker)"
                         elif not test_output:
                             reason = "no test output between markers"
@@ -1363,7 +1782,7 @@ async def run_pregold_phase_async(
                             reason = "unknown"
                         status = f"⚠️ {reason} (skipping post-gold)"
                         failed_repos.add(task["repo"])
-                        await volume_write_text(
+                        _schedule_volume_write(
                             f"{volume_baseline_dir}/error.txt",
                             f"Pre-gold failed: {reason}",
                         )
@@ -1372,71 +1791,77 @@ async def run_pregold_phase_async(
             else:
                 status = f"ERROR: {result['error'][:50]}"
                 failed_repos.add(task["repo"])
-                await volume_write_text(
+                _schedule_volume_write(
                     f"{volume_baseline_dir}/error.txt",
                     f"Pre-gold sandbox error: {result['error']}",
                 )
         except Exception as e:
             status = f"EXCEPTION: {e}"
             failed_repos.add(task["repo"])
-            try:
-                await volume_write_text(
-                    f"{volume_baseline_dir}/error.txt", f"Pre-gold exception: {e}"
-                )
-            except:
-                pass
-        print(f"  [{completed}/{len(tasks)}] {task['repo']}: {status}")
+            _schedule_volume_write(
+                f"{volume_baseline_dir}/error.txt", f"Pre-gold exception: {e}"
+            )
+        _log_line(f"  [{completed}/{total}] {task['repo']}: {status}")
+        # One baseline per repo, so membership in failed_repos is the verdict
+        yield (task["repo"], task["repo"] not in failed_repos)
 
+    _flush_log()
+    await drain_pending_writes()
     print(f"Pre-gold complete: {completed} baselines")
     if failed_repos:
-        print(f"  ⚠️ {len(failed_repos)} repos will be skipped in post-gold")
+        print(f"  ⚠️ {len(failed_repos)} repos were skipped for post-gold")
     print()
-    return failed_repos
 
 
 async def run_postgold_phase_async(
-    all_patches: list, max_concurrent: int, env_name: str
-) -> list[dict]:
+    all_patches: list, semaphore: asyncio.Semaphore, env_name: str
+) -> AsyncIterator[dict]:
     """
-    Run all post-gold tests using asyncio for efficient concurrent I/O.
+    Run all post-gold tests using asyncio, yielding results as they complete.
 
-    Uses asyncio.Semaphore to limit concurrency instead of ThreadPoolExecutor.
-    This is much more efficient for I/O-bound operations like Modal API calls:
-    - ThreadPoolExecutor with 1000 workers = 1000 threads = high memory/CPU overhead
-    - asyncio with semaphore = 1 thread + event loop = minimal overhead
-    """
+    Streaming keeps memory proportional to in-flight work instead of the
+    total patch count: callers consume each result and drop it.
 
-    print("PHASE: POST-GOLD TESTS")
-    print(f"Running {len(all_patches)} patches, max concurrent: {max_concurrent}")
+    The semaphore is shared with the pre-gold phase so total sandbox
+    concurrency stays bounded even while both phases overlap.
+    """
 
-    # Parallelize volume existence checks to avoid slow sequential roundtrips using asyncio
+    print(f"POST-GOLD: {len(all_patches)} patches")
 
-    async def check_patch_completion(p):
-        path = f"{p['_language']}/run_validation/{p['_repo_id']}/{p['instance_id']}/report.json"
-        return p, await volume_file_exists(path)
+    # One recursive listing per repo answers every patch's report.json
+    # existence question locally, instead of one round-trip per patch
 
     print(f"  Checking {len(all_patches)} patches for existing results (parallel)...")
     tasks = []
 
-    checkout_sem = asyncio.Semaphore(100)  # Limit concurrent checks against volume
+    patches_by_repo: dict[tuple[str, str], list[dict]] = {}
+    for p in all_patches:
+        ann = p["_ann"]
+        patches_by_repo.setdefault((ann.language, ann.repo_id), []).append(p)
 
-    async def check_with_sem(p):
-        async with checkout_sem:
-            return await check_patch_completion(p)
+    async def snapshot_repo(key: tuple[str, str]) -> tuple[tuple[str, str], set[str]]:
+        lang, repo_id = key
+        async with _VOLUME_SEM:
+            return key, await snapshot_volume_tree(f"{lang}/run_validation/{repo_id}")
 
-    check_tasks = [check_with_sem(p) for p in all_patches]
-    if check_tasks:
-        results = await asyncio.gather(*check_tasks)
-    else:
-        results = []
+    snapshots = dict(
+        await asyncio.gather(*(snapshot_repo(key) for key in patches_by_repo))
+    )
+
+    results = []
+    for (lang, repo_id), repo_patches in patches_by_repo.items():
+        snapshot = snapshots[(lang, repo_id)]
+        for p in repo_patches:
+            path = f"{lang}/run_validation/{repo_id}/{p['instance_id']}/report.json"
+            results.append((p, path in snapshot))
 
     for p, exists in results:
         if not exists:
             tasks.append(
                 {
-                    "repo": p["_repo"],
-                    "repo_id": p["_repo_id"],
-                    "profile": p["_profile"],
+                    "repo": p["_ann"].repo,
+                    "repo_id": p["_ann"].repo_id,
+                    "profile": p["_ann"].profile,
                     "instance_id": p["instance_id"],
                     "patch": p["patch"],
                     "workdir": f"/{env_name}",
@@ -1450,150 +1875,217 @@ async def run_postgold_phase_async(
 
     if not tasks:
         print("  All patches already validated!")
-        return []
-
-    # Semaphore controls max concurrent operations
-    semaphore = asyncio.Semaphore(max_concurrent)
-
-    # Install custom exception handler to log socket.send() exception details
-    loop = asyncio.get_running_loop()
-    exception_handler = setup_asyncio_exception_logging()
-    loop.set_exception_handler(exception_handler)
-
-    async def process_single_task(task: dict) -> dict:
-        """Process a single validation task."""
-        lang = task["full_patch"]["_language"]
-        repo_id = task["repo_id"]
-        instance_id = task["instance_id"]
-
-        # Strip internal keys (prefixed with _) that contain non-serializable objects like the profile
-        serializable_patch = {
-            k: v for k, v in task["full_patch"].items() if not k.startswith("_")
-        }
-
-        # Volume path for report (used for both success and failure)
-        report_volume_path = (
-            f"{lang}/run_validation/{repo_id}/{instance_id}/report.json"
-        )
+        return
 
-        postgold_config = {
-            "test_cmd": task["profile"].test_cmd,
-            "output_path": f"/logs/{lang}/run_validation/{repo_id}/{instance_id}/test_output.txt",
-            "baseline_path": f"/logs/{lang}/run_validation/{repo_id}/{repo_id}.ref/test_output.txt",
-            "report_path": f"/logs/{lang}/run_validation/{repo_id}/{instance_id}/report.json",
-            "instance": serializable_patch,
-        }
+    async def process_batch(batch_tasks: list[dict]) -> list[tuple[dict, dict]]:
+        """Validate one batch of same-image patches in a shared sandbox."""
+        profile = batch_tasks[0]["profile"]
+        lang = batch_tasks[0]["full_patch"]["_ann"].language
+        workdir = batch_tasks[0]["workdir"]
+
+        items = [
+            {
+                "instance_id": task["instance_id"],
+                "patch": task["patch"],
+                "test_cmd": profile.test_cmd,
+                "output_path": f"/logs/{lang}/run_validation/{task['repo_id']}/{task['instance_id']}/test_output.txt",
+            }
+            for task in batch_tasks
+        ]
 
-        result = await run_validation_in_sandbox(
+        raw = await run_validation_batch_in_sandbox(
             semaphore=semaphore,
             app=app,
-            image_name=task["profile"].image_name,
-            instance_id=task["instance_id"],
-            test_cmd=task["profile"].test_cmd,
-            workdir=task["workdir"],
-            patch=task["patch"],
-            timeout=task["profile"].timeout,
-            postgold_config=postgold_config,
+            image_name=profile.image_name,
+            workdir=workdir,
+            batch=items,
+            timeout=profile.timeout * len(items) + 60,
         )
+        batch_error = raw.get("__error__", {}).get("error")
+
+        async def finalize(task: dict) -> tuple[dict, dict]:
+            repo_id = task["repo_id"]
+            instance_id = task["instance_id"]
+            result = raw.get(instance_id)
+            if result is None:
+                result = {
+                    "instance_id": instance_id,
+                    "error": batch_error or "No remote result found",
+                }
 
-        # If validation failed (error in result), write a report.json anyway
-        # so this patch won't be retried on subsequent runs
-        if "error" in result and result.get("error"):
-            error_report = {
-                "instance_id": instance_id,
-                "valid": False,
-                "error": result["error"],
-                "PASS_TO_FAIL": [],
-                "FAIL_TO_PASS": [],
-                "skipped": True,  # Mark as skipped so we know it wasn't a real validation
-            }
-            try:
-                await volume_write_text(
-                    report_volume_path, json.dumps(error_report, indent=2)
+            if not result.get("error"):
+                # Strip internal keys (prefixed with _) that contain
+                # non-serializable objects like the profile
+                serializable_patch = {
+                    k: v for k, v in task["full_patch"].items() if not k.startswith("_")
+                }
+                # Grade in the persistent grader function so the grading
+                # imports are amortized across validations
+                graded = await grade_remote.remote.aio(
+                    baseline_path=f"/logs/{lang}/run_validation/{repo_id}/{repo_id}.ref/test_output.txt",
+                    output_path=f"/logs/{lang}/run_validation/{repo_id}/{instance_id}/test_output.txt",
+                    report_path=f"/logs/{lang}/run_validation/{repo_id}/{instance_id}/report.json",
+                    instance=serializable_patch,
                 )
-            except Exception as write_err:
-                print(f"Failed to write error report for {instance_id}: {write_err}")
+                result.update(graded)
 
-        return (task, result)
+            # If validation failed (error in result), write a report.json anyway
+            # so this patch won't be retried on subsequent runs
+            if "error" in result and result.get("error"):
+                error_report = {
+                    "instance_id": instance_id,
+                    "valid": False,
+                    "error": result["error"],
+                    "PASS_TO_FAIL": [],
+                    "FAIL_TO_PASS": [],
+                    "skipped": True,  # Mark as skipped so we know it wasn't a real validation
+                }
+                _schedule_volume_write(
+                    f"{lang}/run_validation/{repo_id}/{instance_id}/report.json",
+                    _json_dumps_indent(error_report),
+                )
+
+            return (task, result)
+
+        return list(await asyncio.gather(*(finalize(t) for t in batch_tasks)))
 
-    # Create all async tasks
-    async_tasks = [process_single_task(t) for t in tasks]
+    # Group by sandbox image so one sandbox can validate a whole batch, then
+    # split groups into fixed-size batches (bounds per-sandbox runtime)
+    groups: dict[tuple[str, str], list[dict]] = {}
+    for t in tasks:
+        groups.setdefault((t["profile"].image_name, t["workdir"]), []).append(t)
+
+    batches = [
+        group[i : i + POSTGOLD_BATCH_SIZE]
+        for group in groups.values()
+        for i in range(0, len(group), POSTGOLD_BATCH_SIZE)
+    ]
+    print(
+        f"  Batched {len(tasks)} patches into {len(batches)} sandboxes "
+        f"({len(groups)} images, up to {POSTGOLD_BATCH_SIZE} patches each)"
+    )
 
     # Track progress
-    results = []
     completed = 0
     valid_count = 0
+    total = len(tasks)
 
-    # Process results as they complete
-    for coro in asyncio.as_completed(async_tasks):
-        task, result = await coro
-        completed += 1
+    # Yield results as they complete, instantiating batch coroutines lazily
+    # to bound the pending-task window
+    async for batch_results in _as_completed_window(map(process_batch, batches)):
+        for task, result in batch_results:
+            completed += 1
 
-        processed = result
-        processed["repo"] = task["repo"]
-        # result already has instance_id, valid, error keys from the sandbox return
+            processed = result
+            processed["repo"] = task["repo"]
+            # result already has instance_id, valid, error keys from the sandbox return
 
-        results.append(processed)
-        if processed.get("valid"):
-            valid_count += 1
-        if completed % 100 == 0 or completed == len(tasks):
-            print(
-                f"  Progress: {completed}/{len(tasks)} tests, {valid_count} valid bugs"
-            )
+            if processed.get("valid"):
+                valid_count += 1
+            if completed % 100 == 0 or completed == total:
+                print(
+                    f"  Progress: {completed}/{total} tests, {valid_count} valid bugs"
+                )
+            yield processed
 
-    print(f"Post-gold complete: {valid_count}/{len(tasks)} valid bugs\n")
-    return results
+    await drain_pending_writes()
+    print(f"Post-gold complete: {valid_count}/{total} valid bugs\n")
 
 
 async def run_validation_phase_async(
     all_patches: list, max_concurrent: int, env_name: str
-) -> list[dict]:
-    """Run complete validation (pre-gold + post-gold). Existing baselines are skipped automatically."""
+) -> AsyncIterator[dict]:
+    """Run complete validation (pre-gold + post-gold), yielding post-gold
+    results as they complete. Existing baselines are skipped automatically."""
     if not all_patches:
         print("No patches to validate.")
-        return []
+        return
 
-    # Count patches per repo and filter out repos with too few patches
-    repo_patch_counts = {}
+    # One pass over the (heavy) patch list partitions it by repo and collects
+    # per-repo metadata at the same time. All later per-repo decisions (size
+    # filter, baseline verdicts) are dict-key operations on this partition —
+    # no further full scans of the patch list
+    patches_by_repo: dict[str, list[dict]] = defaultdict(list)
+    repos_with_patches: dict[str, dict] = {}
     for p in all_patches:
-        repo = p["_repo"]
-        repo_patch_counts[repo] = repo_patch_counts.get(repo, 0) + 1
+        ann = p["_ann"]
+        patches_by_repo[ann.repo].append(p)
+        if ann.repo not in repos_with_patches:
+            repos_with_patches[ann.repo] = {
+                "profile": ann.profile,
+                "repo_id": ann.repo_id,
+                "language": ann.language,
+            }
 
+    # Filter out repos with too few patches
     small_repos = {
         repo
-        for repo, count in repo_patch_counts.items()
-        if count < MIN_PATCHES_FOR_VALIDATION
+        for repo, patches in patches_by_repo.items()
+        if len(patches) < MIN_PATCHES_FOR_VALIDATION
     }
     if small_repos:
-        original_count = len(all_patches)
-        all_patches = [p for p in all_patches if p["_repo"] not in small_repos]
+        filtered_count = sum(len(patches_by_repo[repo]) for repo in small_repos)
+        for repo in small_repos:
+            del patches_by_repo[repo]
+            del repos_with_patches[repo]
         print(
             f"Skipping {len(small_repos)} repos with <{MIN_PATCHES_FOR_VALIDATION} patches: {', '.join(sorted(small_repos))}"
         )
-        print(f"Filtered out {original_count - len(all_patches)} patches\n")
+        print(f"Filtered out {filtered_count} patches\n")
 
-    if not all_patches:
+    if not patches_by_repo:
         print("No patches remaining after filtering.")
-        return []
-
-    repos_with_patches = build_repos_with_patches(all_patches)
+        return
 
     # Pre-build all validator images before starting validation
     await prebuild_validator_images_async(repos_with_patches)
 
-    failed_repos = await run_pregold_phase_async(
-        repos_with_patches, max_concurrent, env_name
-    )
+    # Install custom exception handler to log socket.send() exception details
+    loop = asyncio.get_running_loop()
+    exception_handler = setup_asyncio_exception_logging()
+    loop.set_exception_handler(exception_handler)
 
-    # Filter out patches from repos with broken baselines
-    if failed_repos:
-        original_count = len(all_patches)
-        all_patches = [p for p in all_patches if p["_repo"] not in failed_repos]
-        print(
-            f"Filtered out {original_count - len(all_patches)} patches from {len(failed_repos)} repos with broken baselines"
-        )
+    # One semaphore is shared by both phases: post-gold for a repo whose
+    # baseline is ready runs alongside still-pending baselines without
+    # exceeding the global sandbox budget
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    # Pipeline the phases: the pre-gold stream reports each repo's baseline
+    # verdict as it lands, and a pump task immediately starts that repo's
+    # post-gold validation. Results funnel through a queue so the caller
+    # still sees one flat stream.
+    results_queue: asyncio.Queue = asyncio.Queue()
+    done_sentinel = object()
+
+    async def pump_postgold(repo_patches: list[dict]) -> None:
+        async for result in run_postgold_phase_async(repo_patches, semaphore, env_name):
+            await results_queue.put(result)
+
+    async def coordinate() -> None:
+        pumps: list[asyncio.Task] = []
+        try:
+            async for repo, baseline_ok in run_pregold_phase_async(
+                repos_with_patches, semaphore, env_name
+            ):
+                if baseline_ok:
+                    pumps.append(
+                        asyncio.create_task(pump_postgold(patches_by_repo[repo]))
+                    )
+                else:
+                    print(
+                        f"  Skipping {len(patches_by_repo[repo])} patches from {repo} (broken baseline)"
+                    )
+            await asyncio.gather(*pumps)
+        finally:
+            await results_queue.put(done_sentinel)
 
-    return await run_postgold_phase_async(all_patches, max_concurrent, env_name)
+    coordinator = asyncio.create_task(coordinate())
+    while True:
+        item = await results_queue.get()
+        if item is done_sentinel:
+            break
+        yield item
+    await coordinator
 
 
 def print_summary(results: list[dict], repos_count: int):
@@ -1604,16 +2096,16 @@ def print_summary(results: list[dict], repos_count: int):
     print(f"RESULTS: {valid_count} valid bugs out of {len(results)} patches")
     print(f"{'=' * 60}")
 
-    repo_stats = {}
+    repo_stats: dict[str, dict[str, int]] = defaultdict(
+        lambda: {"total": 0, "valid": 0, "errors": 0}
+    )
     for r in results:
-        repo = r["repo"]
-        if repo not in repo_stats:
-            repo_stats[repo] = {"total": 0, "valid": 0, "errors": 0}
-        repo_stats[repo]["total"] += 1
+        stats = repo_stats[r["repo"]]
+        stats["total"] += 1
         if r.get("valid"):
-            repo_stats[repo]["valid"] += 1
+            stats["valid"] += 1
         if "error" in r:
-            repo_stats[repo]["errors"] += 1
+            stats["errors"] += 1
 
     print("\nPer-repo breakdown:")
     for repo, stats in sorted(repo_stats.items()):
@@ -1630,38 +2122,60 @@ def print_summary(results: list[dict], repos_count: int):
 # ============================================================================
 
 
-async def show_volume_stats(language: str) -> None:
+def _parse_report(content: bytes) -> tuple[bool, bool]:
+    """Extract (is_validated, is_valid) from raw report.json bytes.
+
+    Top-level so it could be shipped to an executor, though in practice a
+    report is ~1 KB and orjson parses it in microseconds — far below the
+    pickling cost of dispatching to a process pool, so parsing stays on
+    the event loop.
+    """
+    try:
+        report = _json_loads(content)
+    except json.JSONDecodeError:
+        return (False, False)
+    if isinstance(report, dict):
+        p2f = report.get("PASS_TO_FAIL")
+        return (True, bool(p2f))
+    return (False, False)
+
+
+async def show_volume_stats(language: str, concurrency: int = 512) -> None:
     """Display a bug breakdown by reading validation results from the Modal Volume.
 
     Similar to count_bugs_to_file.py but reads from Modal Volume instead of local files.
-    Uses parallel I/O for faster stats collection.
+    Uses parallel I/O for faster stats collection; files are read as bytes
+    and parsed with _json_loads, so orjson (when installed) skips the
+    bytes->str decode entirely.
+
+    Stats reads are tiny and latency-bound, so this uses its own, much
+    higher concurrency cap than _VOLUME_SEM (which is sized for the
+    validation pipeline's mixed read/write traffic).
     """
     print(f"\nReading stats from volume '{VOLUME_NAME}/{language}/'...\n")
 
+    read_sem = asyncio.Semaphore(concurrency)
+
     repo_stats: dict[str, dict[str, int]] = {}
     modifier_stats: dict[str, dict[str, int]] = {}  # Track stats by modifier
-    semaphore = asyncio.Semaphore(100)  # Limit concurrent reads
 
     def extract_modifier(instance_id: str) -> str:
         """Extract modifier name from instance_id (format: repo_id.modifier__hash).
 
         Example instance_id: Shopify__draggable.8a1eed57.func_pm_arg_swap__abc123
         Should extract: func_pm_arg_swap
+
+        Called once per patch and once per report, so it uses rfind/slice
+        instead of rsplit (no intermediate lists) and interns the result —
+        modifier names are a small closed set, and interning makes the
+        stats-dict key lookups pointer comparisons.
         """
-        # The modifier is the part before the final '__' which is followed by the hash
-        # Find the last occurrence of '__' and take what's before it
-        if "__" not in instance_id:
+        # The modifier sits between the last '.' and the final '__<hash>'
+        sep = instance_id.rfind("__")
+        if sep < 0:
             return "unknown"
-
-        # Split by '__' and take the second-to-last part
-        # e.g., "repo.commit.func_pm_arg_swap__abc123" -> ["repo.commit.func_pm_arg_swap", "abc123"]
-        before_hash = instance_id.rsplit("__", 1)[0]  # "repo.commit.func_pm_arg_swap"
-
-        # The modifier is the last dot-separated part
-        # e.g., "repo.commit.func_pm_arg_swap" -> "func_pm_arg_swap"
-        if "." in before_hash:
-            return before_hash.rsplit(".", 1)[-1]  # Get last part after final '.'
-        return before_hash
+        dot = instance_id.rfind(".", 0, sep)
+        return sys.intern(instance_id[dot + 1 : sep])
 
     # 1. Count generated bugs from patches files (parallel)
     bug_gen_dir = f"{language}/bug_gen"
@@ -1669,38 +2183,49 @@ async def show_volume_stats(language: str) -> None:
         entries = await logs_volume.listdir.aio(bug_gen_dir)
         patch_files = [e for e in entries if e.path.endswith("_all_patches.json")]
 
-        async def read_patches(entry) -> tuple[str, int, list[dict]]:
-            async with semaphore:
+        async def read_patches(entry) -> tuple[str, int, dict[str, int]]:
+            """Read one patches file and reduce it to (repo_id, count, per-modifier counts).
+
+            Only instance_id is needed from each patch, so the parsed list is
+            reduced to small counters inside the coroutine and freed right
+            away — the gather accumulates counts, not every repo's full
+            patch dicts.
+            """
+            async with read_sem:
                 # entry.path is the full path, extract just the filename
-                filename = entry.path.split("/")[-1]
-                repo_id = filename.replace("_all_patches.json", "")
+                # (rpartition: no intermediate list, unlike split("/"))
+                filename = entry.path.rpartition("/")[2]
+                repo_id = filename.removesuffix("_all_patches.json")
                 # Use entry.path directly as it's the full path
-                content = await volume_read_text(entry.path)
+                content = await volume_read_bytes(entry.path)
                 if content:
                     try:
-                        patches = json.loads(content)
-                        return (repo_id, len(patches), patches)
+                        patches = _json_loads(content)
                     except json.JSONDecodeError:
-                        pass
-                return (repo_id, 0, [])
+                        return (repo_id, 0, {})
+                    modifier_counts: dict[str, int] = defaultdict(int)
+                    for patch in patches:
+                        modifier_counts[
+                            extract_modifier(patch.get("instance_id", ""))
+                        ] += 1
+                    return (repo_id, len(patches), modifier_counts)
+                return (repo_id, 0, {})
 
         results = await asyncio.gather(*[read_patches(e) for e in patch_files])
-        for repo_id, count, patches in results:
+        for repo_id, count, modifier_counts in results:
             if repo_id not in repo_stats:
                 repo_stats[repo_id] = {"generated": 0, "validated": 0, "valid": 0}
             repo_stats[repo_id]["generated"] = count
 
-            # Count generated bugs by modifier
-            for patch in patches:
-                instance_id = patch.get("instance_id", "")
-                modifier = extract_modifier(instance_id)
+            # Merge generated-bug counts by modifier
+            for modifier, n in modifier_counts.items():
                 if modifier not in modifier_stats:
                     modifier_stats[modifier] = {
                         "generated": 0,
                         "validated": 0,
                         "valid": 0,
                     }
-                modifier_stats[modifier]["generated"] += 1
+                modifier_stats[modifier]["generated"] += n
 
         print(f"  Found {len(patch_files)} repos with patches")
     except Exception as e:
@@ -1709,71 +2234,44 @@ async def show_volume_stats(language: str) -> None:
     # 2. Count validated bugs from run_validation directory (parallel)
     run_validation_dir = f"{language}/run_validation"
     try:
-        repo_entries = await logs_volume.listdir.aio(run_validation_dir)
-
-        # First, collect all report.json paths to read (with instance_id for modifier extraction)
-        all_report_paths: list[
-            tuple[str, str, str]
-        ] = []  # (repo_id, report_path, instance_id)
-
-        async def list_repo_instances(repo_entry) -> list[tuple[str, str, str]]:
-            """List all instance report paths for a repo."""
-            async with semaphore:
-                # entry.path is full path like "javascript/run_validation/repo_id"
-                repo_id = repo_entry.path.split("/")[-1]
-                repo_path = repo_entry.path  # Use full path directly
-                paths = []
-                try:
-                    instance_entries = await logs_volume.listdir.aio(repo_path)
-                    for instance_entry in instance_entries:
-                        # instance_entry.path is full path
-                        instance_id = instance_entry.path.split("/")[-1]
-                        if not instance_id.endswith(".ref"):
-                            report_path = f"{instance_entry.path}/report.json"
-                            paths.append((repo_id, report_path, instance_id))
-                except Exception:
-                    pass
-                return paths
 
-        # Gather all report paths in parallel
-        repo_entries_filtered = [e for e in repo_entries if not e.path.endswith("/")]
-        path_results = await asyncio.gather(
-            *[list_repo_instances(e) for e in repo_entries_filtered]
-        )
-        for paths in path_results:
-            all_report_paths.extend(paths)
-
-        print(f"  Found {len(all_report_paths)} validation reports to check")
-
-        # Initialize repo_stats for all repos
-        for repo_entry in repo_entries_filtered:
-            repo_id = repo_entry.path.split("/")[-1]
-            if repo_id not in repo_stats:
-                repo_stats[repo_id] = {"generated": 0, "validated": 0, "valid": 0}
-
-        # Read all reports in parallel
         async def read_report(
             item: tuple[str, str, str],
         ) -> tuple[str, str, bool, bool]:
             """Read a report and return (repo_id, modifier, is_validated, is_valid)."""
-            async with semaphore:
+            async with read_sem:
                 repo_id, report_path, instance_id = item
                 modifier = extract_modifier(instance_id)
-                content = await volume_read_text(report_path)
+                content = await volume_read_bytes(report_path)
                 if content:
-                    try:
-                        report = json.loads(content)
-                        if isinstance(report, dict):
-                            p2f = report.get("PASS_TO_FAIL")
-                            is_valid = p2f and len(p2f) > 0
-                            return (repo_id, modifier, True, is_valid)
-                    except json.JSONDecodeError:
-                        pass
+                    is_validated, is_valid = _parse_report(content)
+                    return (repo_id, modifier, is_validated, is_valid)
                 return (repo_id, modifier, False, False)
 
-        report_results = await asyncio.gather(
-            *[read_report(item) for item in all_report_paths]
-        )
+        # Stream the recursive listing and launch each report read the moment
+        # its entry arrives, so read latency overlaps the remainder of the
+        # listing instead of waiting behind it
+        prefix_len = len(run_validation_dir) + 1
+        read_tasks: list[asyncio.Task] = []
+        async for entry in logs_volume.iterdir.aio(run_validation_dir, recursive=True):
+            # entry.path is the full path, e.g.
+            # "javascript/run_validation/repo_id/instance_id/report.json"
+            parts = entry.path[prefix_len:].split("/")
+            repo_id = parts[0]
+            if repo_id and repo_id not in repo_stats:
+                repo_stats[repo_id] = {"generated": 0, "validated": 0, "valid": 0}
+            if (
+                len(parts) == 3
+                and parts[2] == "report.json"
+                and not parts[1].endswith(".ref")
+            ):
+                read_tasks.append(
+                    asyncio.create_task(read_report((repo_id, entry.path, parts[1])))
+                )
+
+        print(f"  Found {len(read_tasks)} validation reports to check")
+
+        report_results = await asyncio.gather(*read_tasks)
         for repo_id, modifier, is_validated, is_valid in report_results:
             if is_validated:
                 repo_stats[repo_id]["validated"] += 1
@@ -1795,20 +2293,25 @@ async def show_volume_stats(language: str) -> None:
         print(f"Warning: Could not read run_validation directory: {e}")
 
     # 3. Print formatted output
-    import re
-    import statistics
-
     def truncate_repo_name(repo_id: str) -> str:
         """Remove the commit hash suffix (e.g., '.3ec3512d') and replace __ with /."""
-        # Pattern matches a dot followed by 8 hex characters at the end
-        name = re.sub(r"\.[a-f0-9]{8}$", "", repo_id)
-        # Replace __ with / for display
-        return name.replace("__", "/")
+        return _COMMIT_HASH_RE.sub("", repo_id).replace("__", "/")
 
     def calc_stats(values: list[float]) -> tuple[float, float, float, float, float]:
         """Calculate mean, std, min, median, max for a list of values."""
         if not values:
             return (0, 0, 0, 0, 0)
+        if np is not None:
+            # fromiter fills one float64 buffer directly (np.array would
+            # build an intermediate object array first)
+            a = np.fromiter(values, dtype=np.float64, count=len(values))
+            return (
+                float(a.mean()),
+                float(a.std(ddof=1)) if a.size > 1 else 0.0,
+                float(a.min()),
+                float(np.median(a)),
+                float(a.max()),
+            )
         mean = statistics.mean(values)
         std = statistics.stdev(values) if len(values) > 1 else 0
         min_val = min(values)
@@ -1821,7 +2324,11 @@ async def show_volume_stats(language: str) -> None:
         stats_dict: dict[str, dict[str, int]],
         display_names: dict[str, str] | None = None,
     ) -> None:
-        """Print a formatted stats table with totals and statistics."""
+        """Print a formatted stats table with totals and statistics.
+
+        Rows accumulate in a StringIO and hit stdout as one write at the
+        end, instead of one syscall per row.
+        """
         if display_names is None:
             display_names = {k: k for k in stats_dict.keys()}
 
@@ -1834,10 +2341,15 @@ async def show_volume_stats(language: str) -> None:
             max_name_len + 3 + 6 + 3 + 6 + 3 + 6 + 3 + 8
         )  # name + separators + columns
 
-        print(
-            f"{header:<{max_name_len}} | {'Gen':>6} | {'Val':>6} | {'Valid':>6} | {'Pass%':>8}"
+        buf = io.StringIO()
+        w = buf.write
+        row_fmt = f"{{:<{max_name_len}}} | {{:>6}} | {{:>6}} | {{:>6}} | {{:>7.1f}}%\n"
+        rule = "-" * total_width + "\n"
+
+        w(
+            f"{header:<{max_name_len}} | {'Gen':>6} | {'Val':>6} | {'Valid':>6} | {'Pass%':>8}\n"
         )
-        print("-" * total_width)
+        w(rule)
 
         total_gen = 0
         total_val = 0
@@ -1866,15 +2378,11 @@ async def show_volume_stats(language: str) -> None:
             pass_rate_values.append(pass_rate)
 
             display_name = display_names.get(item_id, item_id)
-            print(
-                f"{display_name:<{max_name_len}} | {gen:>6} | {val:>6} | {valid:>6} | {pass_rate:>7.1f}%"
-            )
+            w(row_fmt.format(display_name, gen, val, valid, pass_rate))
 
-        print("-" * total_width)
+        w(rule)
         total_pass_rate = (total_valid / total_val * 100) if total_val > 0 else 0
-        print(
-            f"{'TOTAL':<{max_name_len}} | {total_gen:>6} | {total_val:>6} | {total_valid:>6} | {total_pass_rate:>7.1f}%"
-        )
+        w(row_fmt.format("TOTAL", total_gen, total_val, total_valid, total_pass_rate))
 
         # Calculate and print statistics (mean, std, min, median, max)
         if len(stats_dict) > 0:
@@ -1883,23 +2391,26 @@ async def show_volume_stats(language: str) -> None:
             valid_stats = calc_stats(valid_values)
             pass_stats = calc_stats(pass_rate_values)
 
-            print("-" * total_width)
-            print(
-                f"{'MEAN':<{max_name_len}} | {gen_stats[0]:>6.1f} | {val_stats[0]:>6.1f} | {valid_stats[0]:>6.1f} | {pass_stats[0]:>7.1f}%"
+            w(rule)
+            w(
+                f"{'MEAN':<{max_name_len}} | {gen_stats[0]:>6.1f} | {val_stats[0]:>6.1f} | {valid_stats[0]:>6.1f} | {pass_stats[0]:>7.1f}%\n"
             )
-            print(
-                f"{'STD':<{max_name_len}} | {gen_stats[1]:>6.1f} | {val_stats[1]:>6.1f} | {valid_stats[1]:>6.1f} | {pass_stats[1]:>7.1f}%"
+            w(
+                f"{'STD':<{max_name_len}} | {gen_stats[1]:>6.1f} | {val_stats[1]:>6.1f} | {valid_stats[1]:>6.1f} | {pass_stats[1]:>7.1f}%\n"
             )
-            print(
-                f"{'MIN':<{max_name_len}} | {gen_stats[2]:>6.0f} | {val_stats[2]:>6.0f} | {valid_stats[2]:>6.0f} | {pass_stats[2]:>7.1f}%"
+            w(
+                f"{'MIN':<{max_name_len}} | {gen_stats[2]:>6.0f} | {val_stats[2]:>6.0f} | {valid_stats[2]:>6.0f} | {pass_stats[2]:>7.1f}%\n"
             )
-            print(
-                f"{'MEDIAN':<{max_name_len}} | {gen_stats[3]:>6.1f} | {val_stats[3]:>6.1f} | {valid_stats[3]:>6.1f} | {pass_stats[3]:>7.1f}%"
+            w(
+                f"{'MEDIAN':<{max_name_len}} | {gen_stats[3]:>6.1f} | {val_stats[3]:>6.1f} | {valid_stats[3]:>6.1f} | {pass_stats[3]:>7.1f}%\n"
             )
-            print(
-                f"{'MAX':<{max_name_len}} | {gen_stats[4]:>6.0f} | {val_stats[4]:>6.0f} | {valid_stats[4]:>6.0f} | {pass_stats[4]:>7.1f}%"
+            w(
+                f"{'MAX':<{max_name_len}} | {gen_stats[4]:>6.0f} | {val_stats[4]:>6.0f} | {valid_stats[4]:>6.0f} | {pass_stats[4]:>7.1f}%\n"
             )
 
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
     # Print Repository table
     display_names = {
         repo_id: truncate_repo_name(repo_id) for repo_id in repo_stats.keys()
@@ -1941,6 +2452,7 @@ async def main(
     max_candidates: int = 2000,
     max_concurrent_tests: int = 900,
     show_stats: bool = False,
+    stats_concurrency: int = 512,
 ):
     """
     Modal Bug Generation & Validation script.
@@ -1960,10 +2472,11 @@ async def main(
         max_candidates: Max candidates to process, -1 for all (default: 2000)
         max_concurrent_tests: Max concurrent tests (default: 900)
         show_stats: If True, show bug breakdown stats and exit without running generation/validation
+        stats_concurrency: Max concurrent volume reads for --show-stats (default: 512)
     """
     # Handle --show-stats early exit
     if show_stats:
-        await show_volume_stats(language)
+        await show_volume_stats(language, stats_concurrency)
         return
 
     from swesmith.constants import ENV_NAME
@@ -2009,15 +2522,32 @@ async def main(
     print(f"{'#' * 60}\n")
 
     print("Collecting patches from volume...")
-    all_patches = await collect_patches_from_files(target_repos, language)
+    all_patches, repo_registry = await collect_patches_from_files(
+        target_repos, language
+    )
     print(f"Total: {len(all_patches)} patches\n")
 
-    results = await run_validation_phase_async(
+    # Consume the validation stream, keeping only the summary fields so
+    # memory doesn't grow with raw outputs and patch blobs
+    results = []
+    async for r in run_validation_phase_async(
         all_patches, max_concurrent_tests, ENV_NAME
-    )
+    ):
+        summary = {
+            "repo": r.get("repo"),
+            "instance_id": r.get("instance_id"),
+            "valid": r.get("valid"),
+        }
+        if "error" in r:
+            summary["error"] = r["error"]
+        results.append(summary)
+
+    # Let the background sandbox reaper finish before reporting
+    await drain_pending_writes()
+    await drain_pending_terminations()
 
     if results:
-        print_summary(results, len(build_repos_with_patches(all_patches)))
+        print_summary(results, len(repo_registry))
 
     # Report generation errors from this run
     errors = [r for r in generation_results if "error" in r]
@@ -10,6 +10,8 @@ from __future__ import annotations
 
 import argparse
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -21,6 +23,64 @@ def _to_token_list(token_ids: Any) -> list[int]:
     return list(token_ids)
 
 
+def _prefix_token_lengths_exact(
+    tokenizer, messages: list[dict[str, Any]]
+) -> list[int]:
+    """Token length of each rendered prefix messages[:i+1], by re-tokenizing.
+
+    O(N^2) in total tokens; only used as a fallback when the incremental
+    path detects that the chat template is not prefix-stable.
+    """
+    lengths = []
+    for i in range(len(messages)):
+        lengths.append(
+            len(
+                _to_token_list(
+                    tokenizer.apply_chat_template(
+                        messages[: i + 1],
+                        tokenize=True,
+                        add_generation_prompt=False,
+                    )
+                )
+            )
+        )
+    return lengths
+
+
+def _prefix_token_lengths(
+    tokenizer, messages: list[dict[str, Any]], full_len: int
+) -> list[int]:
+    """Token length of each rendered prefix messages[:i+1].
+
+    Renders each prefix as a string (cheap template expansion) and tokenizes
+    only the per-message string delta, so tokenizer work is O(total tokens)
+    instead of O(N^2) from re-tokenizing every prefix. Falls back to exact
+    re-tokenization if the template is not prefix-stable or the incremental
+    lengths drift from the full tokenization.
+    """
+    lengths: list[int] = []
+    prev_text = ""
+    pos = 0
+    for i in range(len(messages)):
+        cur_text = tokenizer.apply_chat_template(
+            messages[: i + 1],
+            tokenize=False,
+            add_generation_prompt=False,
+        )
+        if not cur_text.startswith(prev_text):
+            return _prefix_token_lengths_exact(tokenizer, messages)
+        delta = cur_text[len(prev_text) :]
+        pos += len(tokenizer(delta, add_special_tokens=False)["input_ids"])
+        lengths.append(pos)
+        prev_text = cur_text
+
+    if lengths and lengths[-1] != full_len:
+        # Delta tokenization disagreed with the full pass at some message
+        # boundary; recompute exactly rather than misplace the mask
+        return _prefix_token_lengths_exact(tokenizer, messages)
+    return lengths
+
+
 def build_ids_and_assistant_mask(
     tokenizer, messages: list[dict[str, Any]], max_seq_len: int
 ) -> tuple[list[int], list[int]]:
@@ -33,21 +93,15 @@ def build_ids_and_assistant_mask(
     )
     assistant_mask = [0] * len(full_ids)
 
-    prev_ids: list[int] = []
-    for i, msg in enumerate(messages):
-        cur_ids = _to_token_list(
-            tokenizer.apply_chat_template(
-                messages[: i + 1],
-                tokenize=True,
-                add_generation_prompt=False,
-            )
-        )
-        start = min(len(prev_ids), len(full_ids))
-        end = min(len(cur_ids), len(full_ids))
+    prefix_lengths = _prefix_token_lengths(tokenizer, messages, len(full_ids))
+    prev_len = 0
+    for msg, cur_len in zip(messages, prefix_lengths):
+        start = min(prev_len, len(full_ids))
+        end = min(cur_len, len(full_ids))
         if msg.get("role") == "assistant" and end > start:
             for j in range(start, end):
                 assistant_mask[j] = 1
-        prev_ids = cur_ids
+        prev_len = cur_len
 
     if len(full_ids) > max_seq_len:
         full_ids = full_ids[:max_seq_len]
@@ -62,36 +116,107 @@ def eval_one_sequence_chunked(
     token_ids: list[int],
     assistant_mask: list[int],
     chunk_size: int,
+    pad_id: int = 0,
 ) -> tuple[int, int]:
     import torch
 
     if len(token_ids) < 2:
         return 0, 0
 
-    correct = 0
-    total = 0
     past_key_values = None
     seq_len = len(token_ids)
 
+    # Counts accumulate on device; .item() would force a GPU sync per chunk,
+    # so the only sync is the one readback after the loop. Host staging
+    # buffers are pinned so the H2D copies can overlap compute.
+    correct_t = torch.zeros((), dtype=torch.long, device=device)
+    total_t = torch.zeros((), dtype=torch.long, device=device)
+    pin = device.type == "cuda"
+    x_host = torch.empty((1, chunk_size), dtype=torch.long, pin_memory=pin)
+    y_host = torch.empty(chunk_size, dtype=torch.long, pin_memory=pin)
+    m_host = torch.empty(chunk_size, dtype=torch.bool, pin_memory=pin)
+    # Guards buffer reuse: the async copies must finish before the host
+    # buffers are overwritten for the next chunk
+    copy_done = torch.cuda.Event() if pin else None
+
     for start in range(0, seq_len - 1, chunk_size):
+        if copy_done is not None and start > 0:
+            copy_done.synchronize()
         stop = min(start + chunk_size, seq_len - 1)
-        x = torch.tensor([token_ids[start:stop]], dtype=torch.long, device=device)
-        y = torch.tensor(token_ids[start + 1 : stop + 1], dtype=torch.long, device=device)
-        m = torch.tensor(
-            assistant_mask[start + 1 : stop + 1], dtype=torch.bool, device=device
-        )
+        ids = token_ids[start:stop]
+        targets = token_ids[start + 1 : stop + 1]
+        flags = assistant_mask[start + 1 : stop + 1]
+        if len(ids) < chunk_size:
+            # Pad the trailing chunk to a fixed shape so a compiled model
+            # sees identical input sizes every call. Padding sits at the
+            # end, so causal attention keeps it out of the real positions,
+            # and the mask keeps it out of the score.
+            fill = chunk_size - len(ids)
+            ids = ids + [pad_id] * fill
+            targets = targets + [pad_id] * fill
+            flags = flags + [0] * fill
+        x_host[0] = torch.as_tensor(ids, dtype=torch.long)
+        y_host.copy_(torch.as_tensor(targets, dtype=torch.long))
+        m_host.copy_(torch.as_tensor(flags, dtype=torch.bool))
+        x = x_host.to(device, non_blocking=True)
+        y = y_host.to(device, non_blocking=True)
+        m = m_host.to(device, non_blocking=True)
+        if copy_done is not None:
+            copy_done.record()
 
         out = model(input_ids=x, past_key_values=past_key_values, use_cache=True)
         past_key_values = out.past_key_values
         pred = torch.argmax(out.logits[0], dim=-1)
 
-        if m.any():
-            correct += int((pred[m] == y[m]).sum().item())
-            total += int(m.sum().item())
+        correct_t += ((pred == y) & m).sum()
+        total_t += m.sum()
 
         del x, y, m, out, pred
 
-    return correct, total
+    return int(correct_t.item()), int(total_t.item())
+
+
+def eval_batch_short(
+    model,
+    device,
+    pad_id: int,
+    seqs: list[tuple[list[int], list[int]]],
+) -> list[tuple[int, int]]:
+    """Evaluate several short sequences in one padded forward pass.
+
+    A batch of 1 leaves the GPU badly underutilized on sequences that fit
+    in a single chunk; padding K of them to a common length amortizes the
+    forward pass. Only used for sequences short enough to skip the
+    chunked KV-cache path.
+    """
+    import torch
+
+    batch = len(seqs)
+    max_len = max(len(ids) for ids, _ in seqs)
+    input_ids = torch.full((batch, max_len), pad_id, dtype=torch.long)
+    attention_mask = torch.zeros((batch, max_len), dtype=torch.long)
+    target_mask = torch.zeros((batch, max_len), dtype=torch.bool)
+    for b, (ids, mask) in enumerate(seqs):
+        n = len(ids)
+        input_ids[b, :n] = torch.tensor(ids, dtype=torch.long)
+        attention_mask[b, :n] = 1
+        if n >= 2:
+            # Position j predicts token j+1: mask positions 0..n-2 with the
+            # assistant flags of tokens 1..n-1
+            target_mask[b, : n - 1] = torch.tensor(mask[1:n], dtype=torch.bool)
+
+    input_ids = input_ids.to(device)
+    attention_mask = attention_mask.to(device)
+    target_mask = target_mask.to(device)
+
+    out = model(input_ids=input_ids, attention_mask=attention_mask)
+    pred = torch.argmax(out.logits, dim=-1)
+
+    hits = (pred[:, :-1] == input_ids[:, 1:]) & target_mask[:, :-1]
+    correct_per_seq = hits.sum(dim=1).tolist()
+    total_per_seq = target_mask[:, :-1].sum(dim=1).tolist()
+    del input_ids, attention_mask, target_mask, out, pred, hits
+    return [(int(c), int(t)) for c, t in zip(correct_per_seq, total_per_seq)]
 
 
 def main() -> None:
@@ -103,7 +228,19 @@ def main() -> None:
     parser.add_argument("--max_seq_len", type=int, default=32768)
     parser.add_argument("--chunk_size", type=int, default=2048)
     parser.add_argument("--sample_limit", type=int, default=0)
+    parser.add_argument("--max_batch", type=int, default=8)
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="torch.compile the model (pays compile time up front; chunk shapes are fixed so graphs replay)",
+    )
     parser.add_argument("--dtype", choices=["bf16", "fp16", "fp32"], default="bf16")
+    parser.add_argument(
+        "--quant",
+        choices=["none", "int8"],
+        default="none",
+        help="int8 weight-only quantization via bitsandbytes (top-1 argmax is robust to it; ~2x throughput, half the VRAM)",
+    )
     parser.add_argument("--output_json", type=Path, default=None)
     args = parser.parse_args()
 
@@ -123,72 +260,161 @@ def main() -> None:
     if not torch.cuda.is_available():
         raise RuntimeError("CUDA is required for this evaluation script.")
 
+    quantization_config = None
+    if args.quant == "int8":
+        from transformers import BitsAndBytesConfig
+
+        quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+
     tokenizer = AutoTokenizer.from_pretrained(args.model_path, trust_remote_code=True)
     model = AutoModelForCausalLM.from_pretrained(
         args.model_path,
         torch_dtype=torch_dtype,
         trust_remote_code=True,
         device_map="auto",
+        quantization_config=quantization_config,
     )
     model.eval()
+    if args.compile:
+        model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
     device = next(model.parameters()).device
 
-    records = []
-    with args.data_file.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                records.append(json.loads(line))
-
+    def iter_records(path: Path, limit: int):
+        # Stream records one at a time instead of pinning the whole JSONL
+        # in memory alongside the model
+        with path.open("rb") as f:
+            n = 0
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                yield json.loads(line)
+                n += 1
+                if limit and n >= limit:
+                    break
+
+    # Cheap line-count pass so progress output keeps its denominator
+    with args.data_file.open("rb") as f:
+        num_records = sum(1 for line in f if line.strip())
     if args.sample_limit > 0:
-        records = records[: args.sample_limit]
+        num_records = min(num_records, args.sample_limit)
+
+    def iter_tokenized(depth: int = 2):
+        """Yield (token_ids, assistant_mask) per record, or None for bad records.
+
+        Tokenization of upcoming records runs on a worker thread while the
+        GPU evaluates the current one (fast tokenizers release the GIL), so
+        the forward passes don't wait on chat-template work. Lookahead is
+        capped at `depth` to avoid tokenizing far ahead of the GPU.
+        """
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            queue: deque = deque()
+            it = iter_records(args.data_file, args.sample_limit)
+
+            def enqueue() -> bool:
+                try:
+                    rec = next(it)
+                except StopIteration:
+                    return False
+                messages = rec.get("messages")
+                if not isinstance(messages, list) or not messages:
+                    queue.append(None)
+                else:
+                    queue.append(
+                        ex.submit(
+                            build_ids_and_assistant_mask,
+                            tokenizer,
+                            messages,
+                            args.max_seq_len,
+                        )
+                    )
+                return True
+
+            for _ in range(depth):
+                if not enqueue():
+                    break
+            while queue:
+                item = queue.popleft()
+                enqueue()
+                yield None if item is None else item.result()
+
+    pad_id = tokenizer.pad_token_id
+    if pad_id is None:
+        pad_id = tokenizer.eos_token_id or 0
 
     total_correct = 0
     total_tokens = 0
     skipped = 0
+    processed = 0
+    pending: list[tuple[list[int], list[int]]] = []
 
-    for i, rec in enumerate(records, start=1):
-        messages = rec.get("messages")
-        if not isinstance(messages, list) or not messages:
-            skipped += 1
-            continue
-
-        token_ids, assistant_mask = build_ids_and_assistant_mask(
-            tokenizer, messages, args.max_seq_len
-        )
-        c, t = eval_one_sequence_chunked(
-            model=model,
-            device=device,
-            token_ids=token_ids,
-            assistant_mask=assistant_mask,
-            chunk_size=args.chunk_size,
-        )
+    def record_result(c: int, t: int) -> None:
+        nonlocal total_correct, total_tokens, skipped, processed
+        processed += 1
         if t == 0:
             skipped += 1
         total_correct += c
         total_tokens += t
-
         running_acc = (total_correct / total_tokens) if total_tokens > 0 else 0.0
         print(
-            f"[{i}/{len(records)}] sample_tokens={t} running_acc={running_acc:.6f}",
+            f"[{processed}/{num_records}] sample_tokens={t} running_acc={running_acc:.6f}",
             flush=True,
         )
-
-        if i % 5 == 0:
+        if processed % 5 == 0:
             torch.cuda.empty_cache()
 
+    def flush_pending() -> None:
+        if not pending:
+            return
+        for c, t in eval_batch_short(model, device, pad_id, pending):
+            record_result(c, t)
+        pending.clear()
+
+    # inference_mode drops autograd bookkeeping entirely (stricter and a bit
+    # faster than no_grad)
+    with torch.inference_mode():
+        for tokenized in iter_tokenized():
+            if tokenized is None:
+                skipped += 1
+                processed += 1
+                continue
+
+            token_ids, assistant_mask = tokenized
+            if len(token_ids) <= args.chunk_size and args.max_batch > 1:
+                # Short sequences fit in one forward pass; batch them together
+                # instead of running the GPU at batch size 1
+                pending.append((token_ids, assistant_mask))
+                if len(pending) >= args.max_batch:
+                    flush_pending()
+                continue
+
+            flush_pending()
+            c, t = eval_one_sequence_chunked(
+                model=model,
+                device=device,
+                token_ids=token_ids,
+                assistant_mask=assistant_mask,
+                chunk_size=args.chunk_size,
+                pad_id=pad_id,
+            )
+            record_result(c, t)
+
+        flush_pending()
+
     accuracy = (total_correct / total_tokens) if total_tokens > 0 else 0.0
     result = {
         "model_path": args.model_path,
         "data_file": str(args.data_file),
-        "num_samples": len(records),
+        "num_samples": num_records,
         "skipped_samples": skipped,
         "assistant_tokens": total_tokens,
         "correct_tokens": total_correct,
         "assistant_token_accuracy": accuracy,
         "max_seq_len": args.max_seq_len,
         "chunk_size": args.chunk_size,
+        "max_batch": args.max_batch,
         "dtype": args.dtype,
+        "quant": args.quant,
     }
 
     print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -21,11 +21,17 @@ import argparse
 import json
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import yaml
 
+try:  # 可选加速：大任务列表的 JSON 解析/序列化 (swesmith[fast])
+    import orjson
+except ImportError:
+    orjson = None
+
 # 添加项目根目录到路径
 import sys
 
@@ -39,6 +45,20 @@ from swesmith.constants import (
 )
 
 
+def _json_loads(data: bytes):
+    """json.loads，可用时走 orjson 快路径。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_indent(obj) -> str:
+    """带 2 空格缩进的 json.dumps，可用时走 orjson 快路径。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
 def _require_env(name: str) -> None:
     if not os.environ.get(name):
         raise RuntimeError(f"缺少环境变量: {name}")
@@ -72,7 +92,8 @@ def step1_build_environment(profile, *, skip_build: bool) -> None:
 
 
 def step2_generate_bugs_procedural(
-    profile,
+    repo_name: str,
+    bug_gen_root: Path,
     max_bugs: int,
     seed: int,
     interleave: bool,
@@ -86,7 +107,7 @@ def step2_generate_bugs_procedural(
     from swesmith.bug_gen.procedural.generate import main as gen_main
 
     gen_main(
-        repo=profile.repo_name,
+        repo=repo_name,
         max_bugs=max_bugs,
         seed=seed,
         interleave=interleave,
@@ -95,11 +116,12 @@ def step2_generate_bugs_procedural(
         timeout_seconds=timeout_seconds,
     )
 
-    return Path(LOG_DIR_BUG_GEN) / profile.repo_name
+    return bug_gen_root
 
 
 def step2_generate_bugs_llm_modify(
-    profile,
+    repo_name: str,
+    bug_gen_root: Path,
     max_bugs: int,
     model: str,
     config_file: Path,
@@ -108,23 +130,25 @@ def step2_generate_bugs_llm_modify(
     """Step 2b: LLM Modify 生成 bugs"""
     print(f"\n  [LLM-Modify] 使用 {model} 生成 bugs...")
 
-    import subprocess
-    cmd = [
-        "uv", "run", "python", "-m", "swesmith.bug_gen.llm.modify",
-        profile.repo_name,
-        "--config_file", str(config_file),
-        "--model", model,
-        "--max_bugs", str(max_bugs),
-        "--n_workers", str(n_workers),
-    ]
-    print(f"  执行: {' '.join(cmd)}")
-    subprocess.run(cmd, check=True)
+    # 进程内调用（与 procedural 一致），避免每次 uv run 重新解析环境、
+    # 重新导入 swesmith 和 tree-sitter 语法
+    from swesmith.bug_gen.llm.modify import main as modify_main
 
-    return Path(LOG_DIR_BUG_GEN) / profile.repo_name
+    modify_main(
+        config_file=str(config_file),
+        model=model,
+        n_bugs=1,
+        repo=repo_name,
+        n_workers=n_workers,
+        max_bugs=max_bugs,
+    )
+
+    return bug_gen_root
 
 
 def step2_generate_bugs_llm_rewrite(
-    profile,
+    repo_name: str,
+    bug_gen_root: Path,
     max_bugs: int,
     model: str,
     config_file: Path,
@@ -133,7 +157,6 @@ def step2_generate_bugs_llm_rewrite(
     """Step 2c: LLM Rewrite 生成 bugs"""
     print(f"\n  [LLM-Rewrite] 使用 {model} 重写代码生成 bugs...")
 
-    import subprocess
     # 使用 TypeScript rewrite 配置
     rewrite_config = Path("configs/bug_gen/ts_rewrite.yml")
     if not rewrite_config.exists():
@@ -141,22 +164,24 @@ def step2_generate_bugs_llm_rewrite(
     if not rewrite_config.exists():
         rewrite_config = config_file
 
-    cmd = [
-        "uv", "run", "python", "-m", "swesmith.bug_gen.llm.rewrite",
-        profile.repo_name,
-        "--config_file", str(rewrite_config),
-        "--model", model,
-        "--max_bugs", str(max_bugs),
-        "--n_workers", str(n_workers),
-    ]
-    print(f"  执行: {' '.join(cmd)}")
-    subprocess.run(cmd, check=True)
+    # 进程内调用（与 procedural 一致），避免每次 uv run 重新解析环境、
+    # 重新导入 swesmith 和 tree-sitter 语法
+    from swesmith.bug_gen.llm.rewrite import main as rewrite_main
+
+    rewrite_main(
+        repo=repo_name,
+        config_file=str(rewrite_config),
+        model=model,
+        n_workers=n_workers,
+        max_bugs=max_bugs,
+    )
 
-    return Path(LOG_DIR_BUG_GEN) / profile.repo_name
+    return bug_gen_root
 
 
 def step2_generate_bugs(
-    profile,
+    repo_name: str,
+    bug_gen_root: Path,
     method: str,
     max_bugs: int,
     seed: int,
@@ -180,11 +205,10 @@ def step2_generate_bugs(
     print(f"Step 2: 生成 Bugs (方法: {method})")
     print("=" * 60)
 
-    bug_gen_path = Path(LOG_DIR_BUG_GEN) / profile.repo_name
-
     if method in ["procedural", "all"]:
         step2_generate_bugs_procedural(
-            profile=profile,
+            repo_name=repo_name,
+            bug_gen_root=bug_gen_root,
             max_bugs=max_bugs,
             seed=seed,
             interleave=interleave,
@@ -195,7 +219,8 @@ def step2_generate_bugs(
 
     if method in ["llm-modify", "all"]:
         step2_generate_bugs_llm_modify(
-            profile=profile,
+            repo_name=repo_name,
+            bug_gen_root=bug_gen_root,
             max_bugs=max_bugs,
             model=llm_model,
             config_file=llm_config,
@@ -204,14 +229,15 @@ def step2_generate_bugs(
 
     if method in ["llm-rewrite", "all"]:
         step2_generate_bugs_llm_rewrite(
-            profile=profile,
+            repo_name=repo_name,
+            bug_gen_root=bug_gen_root,
             max_bugs=max_bugs,
             model=llm_model,
             config_file=llm_config,
             n_workers=llm_workers,
         )
 
-    return bug_gen_path
+    return bug_gen_root
 
 
 def step3_collect_patches(bug_gen_path: Path, bug_type: str, num_bugs: int) -> Path:
@@ -245,17 +271,12 @@ def step4_validate_f2p(patches_file: Path, workers: int, redo_existing: bool) ->
 
     from swesmith.harness.valid import main as valid_main
 
-    valid_main(str(patches_file), workers, redo_existing=redo_existing)
-
-    # 从 patches 文件内容读取 repo 字段（与 valid.py 内部逻辑一致）
-    # 这样无论 bug_type 或 num_bugs 参数如何，都能正确获取 repo_name
-    with open(patches_file, "r") as f:
-        bug_patches = json.load(f)
-    if not bug_patches:
+    # valid_main 已解析过 patches 文件并返回各 repo 的验证目录，
+    # 不再为了取 repo 字段重新解析一遍（patches 文件可能有几十 MB）
+    report_dirs = valid_main(str(patches_file), workers, redo_existing=redo_existing)
+    if not report_dirs:
         raise ValueError(f"Patches 文件为空: {patches_file}")
-    repo_name = bug_patches[0]["repo"]
-    validation_dir = Path(LOG_DIR_RUN_VALIDATION) / repo_name
-    return validation_dir
+    return report_dirs[0]
 
 
 def step5_gather_instances(
@@ -303,11 +324,19 @@ def _pick_issue_text(issue_meta: dict, model: Optional[str]) -> Optional[str]:
     return None
 
 
+def _read_issue_meta(path: Path) -> Optional[dict]:
+    """读取并解析单个 issue 元数据文件；文件不存在时返回 None。"""
+    try:
+        return _json_loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
 def merge_issue_outputs(
     tasks_file: Path, config_file: Path, issue_exp_id: Optional[str] = None
 ) -> Path:
     """将 issue_gen 生成的文本合并回任务实例"""
-    tasks = json.loads(tasks_file.read_text())
+    tasks = _json_loads(tasks_file.read_bytes())
     config = yaml.safe_load(config_file.read_text())
     model = config.get("model")
 
@@ -317,22 +346,25 @@ def merge_issue_outputs(
 
     out_path = Path(LOG_DIR_ISSUE_GEN) / f"{repo_name}__{issue_exp}_n1.json"
 
+    # 线程池并发读取（先全部提交、再收集），叠加磁盘/网络 FS 的读延迟
     missing = 0
-    for inst in tasks:
-        inst_id = inst.get("instance_id")
-        meta_path = issue_dir / f"{inst_id}.json"
-        if not meta_path.exists():
-            missing += 1
-            continue
-        issue_meta = json.loads(meta_path.read_text())
-        ps = _pick_issue_text(issue_meta, model)
-        if ps:
-            inst["problem_statement"] = ps
-        else:
-            missing += 1
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        futures = [
+            executor.submit(
+                _read_issue_meta, issue_dir / f"{inst.get('instance_id')}.json"
+            )
+            for inst in tasks
+        ]
+        for inst, future in zip(tasks, futures):
+            issue_meta = future.result()
+            ps = _pick_issue_text(issue_meta, model) if issue_meta else None
+            if ps:
+                inst["problem_statement"] = ps
+            else:
+                missing += 1
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(tasks, indent=2, ensure_ascii=False))
+    out_path.write_text(_json_dumps_indent(tasks))
 
     print(f"  ✅ 合并完成: {out_path}")
     if missing:
@@ -341,6 +373,19 @@ def merge_issue_outputs(
     return out_path
 
 
+def _fast_place(src: Path, dst: Path) -> None:
+    """把文件放到目标路径：同文件系统用硬链接 (O(1) 零拷贝)，
+    否则退回 shutil.copyfile（Linux 上走内核 copy_file_range/sendfile 快路径）。
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    # 硬链接不允许覆盖；重跑时先移除旧产物，保持 copy2 的覆盖语义
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 def _normalize_issue_output(tasks_file: Path, suffix: str) -> Path:
     """Normalize issue output path to logs/issue_gen, with legacy fallback.
 
@@ -355,8 +400,7 @@ def _normalize_issue_output(tasks_file: Path, suffix: str) -> Path:
         return canonical
 
     if legacy.exists():
-        canonical.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(legacy, canonical)
+        _fast_place(legacy, canonical)
         print(f"  ℹ️ 检测到旧路径产物，已同步到标准路径: {canonical}")
         return canonical
 
@@ -534,30 +578,41 @@ def main() -> None:
     # 获取 profile（支持内置 + auto_profile_ts 生成的 profiles/generated/*.py）
     from swesmith.profiles import registry, typescript
 
-    available_ts_profiles: dict[str, type] = {}
-    for cls in set(registry.data.values()):
-        if (
-            isinstance(cls, type)
-            and issubclass(cls, typescript.TypeScriptProfile)
-            and cls.__name__ != "TypeScriptProfile"
-        ):
-            available_ts_profiles[cls.__name__] = cls
-
-    profile_cls = available_ts_profiles.get(args.profile)
-    if profile_cls is None:
+    # registry 内部按类名做了记忆化索引，避免每次启动全量扫描
+    profile_cls = registry.get_by_name(args.profile)
+    if not (
+        isinstance(profile_cls, type)
+        and issubclass(profile_cls, typescript.TypeScriptProfile)
+        and profile_cls.__name__ != "TypeScriptProfile"
+    ):
+        # 仅在报错时才枚举全部可用 profile
+        available_ts_profiles = sorted(
+            cls.__name__
+            for cls in set(registry.data.values())
+            if (
+                isinstance(cls, type)
+                and issubclass(cls, typescript.TypeScriptProfile)
+                and cls.__name__ != "TypeScriptProfile"
+            )
+        )
         print(f"❌ 未找到 Profile: {args.profile}")
         print("可用的 TypeScript Profiles:")
-        for name in sorted(available_ts_profiles):
+        for name in available_ts_profiles:
             print(f"  - {name}")
         raise SystemExit(1)
 
     profile = profile_cls()
 
+    # repo_name 是计算属性；各 step 的路径根只算一次，后续直接传参
+    repo_name = profile.repo_name
+    bug_gen_root = Path(LOG_DIR_BUG_GEN) / repo_name
+    validation_root = Path(LOG_DIR_RUN_VALIDATION) / repo_name
+
     print("=" * 60)
     print("TypeScript 标准任务实例生成流程")
     print("=" * 60)
     print(f"Profile: {args.profile}")
-    print(f"repo_name: {profile.repo_name}")
+    print(f"repo_name: {repo_name}")
     print(f"mirror_name: {profile.mirror_name}")
     print(f"image_name: {profile.image_name}")
     print(f"gh_owner_type: {profile.gh_owner_type}")
@@ -569,7 +624,8 @@ def main() -> None:
 
     # Step 2
     bug_gen_path = step2_generate_bugs(
-        profile,
+        repo_name,
+        bug_gen_root,
         method=args.bug_gen_method,
         max_bugs=args.max_bugs,
         seed=args.seed,
@@ -590,7 +646,7 @@ def main() -> None:
     # Step 4
     if args.skip_validation:
         print("\n⚠️ 跳过 F2P 验证")
-        validation_dir = Path(LOG_DIR_RUN_VALIDATION) / profile.repo_name
+        validation_dir = validation_root
     else:
         validation_dir = step4_validate_f2p(
             patches_file, workers=args.workers, redo_existing=args.redo_existing
@@ -619,9 +675,8 @@ def main() -> None:
     # Step 7: 输出最终数据集到 logs/agent_datasets/
     final_path = None
     if issue_out:
-        final_path = Path("logs/agent_datasets") / f"{profile.repo_name}_final.json"
-        final_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(issue_out, final_path)
+        final_path = Path("logs/agent_datasets") / f"{repo_name}_final.json"
+        _fast_place(issue_out, final_path)
 
     print("\n" + "=" * 60)
     print("✅ 完成")
@@ -1,32 +1,51 @@
-from swesmith.bug_gen.adapters.c import get_entities_from_file_c
-from swesmith.bug_gen.adapters.cpp import get_entities_from_file_cpp
-from swesmith.bug_gen.adapters.c_sharp import get_entities_from_file_c_sharp
-from swesmith.bug_gen.adapters.golang import get_entities_from_file_go
-from swesmith.bug_gen.adapters.java import get_entities_from_file_java
-from swesmith.bug_gen.adapters.javascript import get_entities_from_file_js
-from swesmith.bug_gen.adapters.php import get_entities_from_file_php
-from swesmith.bug_gen.adapters.python import get_entities_from_file_py
-from swesmith.bug_gen.adapters.ruby import get_entities_from_file_rb
-from swesmith.bug_gen.adapters.rust import get_entities_from_file_rs
-# Phase 1: Added TypeScript support (2026-02-03)
-from swesmith.bug_gen.adapters.typescript import get_entities_from_file_ts
-
-get_entities_from_file = {
-    ".c": get_entities_from_file_c,
-    ".cpp": get_entities_from_file_cpp,
-    ".cs": get_entities_from_file_c_sharp,
-    ".go": get_entities_from_file_go,
-    ".java": get_entities_from_file_java,
-    ".js": get_entities_from_file_js,
-    # Phase 2: Added JSX support for completeness (2026-02-03)
-    ".jsx": get_entities_from_file_js,
-    ".php": get_entities_from_file_php,
-    ".py": get_entities_from_file_py,
-    ".rb": get_entities_from_file_rb,
-    ".rs": get_entities_from_file_rs,
-    # Phase 1: Added TypeScript/TSX support (2026-02-03)
-    ".ts": get_entities_from_file_ts,
-    ".tsx": get_entities_from_file_ts,
-}
+"""Extension -> entity-extraction dispatch for the language adapters.
+
+Each adapter module imports its tree_sitter_* native extension and
+compiles Language objects at import time, which is tens of ms and a few
+MB RSS per grammar. Single-language runs only pay for the grammars they
+touch: modules are imported on first dispatch, not at package import.
+"""
+
+from importlib import import_module
+
+
+class LazyDispatch(dict):
+    """Dict of ext -> extraction function, importing adapters on first use.
+
+    Initialized with (module_name, function_name) specs; __getitem__
+    swaps a spec for the real callable the first time an extension is
+    looked up. Membership tests and key listing never trigger imports.
+    """
+
+    def __getitem__(self, ext):
+        entry = super().__getitem__(ext)
+        if isinstance(entry, tuple):
+            module_name, func_name = entry
+            entry = getattr(
+                import_module(f"swesmith.bug_gen.adapters.{module_name}"), func_name
+            )
+            self[ext] = entry
+        return entry
+
+
+get_entities_from_file = LazyDispatch(
+    {
+        ".c": ("c", "get_entities_from_file_c"),
+        ".cpp": ("cpp", "get_entities_from_file_cpp"),
+        ".cs": ("c_sharp", "get_entities_from_file_c_sharp"),
+        ".go": ("golang", "get_entities_from_file_go"),
+        ".java": ("java", "get_entities_from_file_java"),
+        ".js": ("javascript", "get_entities_from_file_js"),
+        # Phase 2: Added JSX support for completeness (2026-02-03)
+        ".jsx": ("javascript", "get_entities_from_file_js"),
+        ".php": ("php", "get_entities_from_file_php"),
+        ".py": ("python", "get_entities_from_file_py"),
+        ".rb": ("ruby", "get_entities_from_file_rb"),
+        ".rs": ("rust", "get_entities_from_file_rs"),
+        # Phase 1: Added TypeScript/TSX support (2026-02-03)
+        ".ts": ("typescript", "get_entities_from_file_ts"),
+        ".tsx": ("typescript", "get_entities_from_file_ts"),
+    }
+)
 
 SUPPORTED_EXTS = list(get_entities_from_file.keys())
@@ -0,0 +1,71 @@
+"""
+Batch entity extraction across many source files.
+
+Extraction is embarrassingly parallel at file granularity, but the
+CodeEntity objects the adapters produce hold live tree-sitter nodes,
+which cannot be pickled across process boundaries - so a process pool
+cannot return them. A thread pool is used instead: file reads overlap,
+and parsing moves off the submitting thread (py-tree-sitter releases
+the GIL during parsing in newer releases).
+"""
+
+import os
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from swesmith.bug_gen.adapters import get_entities_from_file
+from swesmith.constants import CodeEntity
+
+
+def _parse_one(file_path: str, max_entities: int) -> list[CodeEntity]:
+    ext = "." + file_path.rsplit(".", 1)[-1].lower() if "." in file_path else ""
+    entities: list[CodeEntity] = []
+    if ext in get_entities_from_file:
+        get_entities_from_file[ext](entities, file_path, max_entities)
+    return entities
+
+
+def parse_files(
+    paths: Iterable[str],
+    max_entities: int = -1,
+    workers: int | None = None,
+) -> Iterator[tuple[str, list[CodeEntity]]]:
+    """
+    Extract entities from many files concurrently.
+
+    Yields (file_path, entities) pairs as extraction completes (not in
+    submission order). Files with unsupported extensions yield an empty
+    list. If max_entities >= 0 it caps the total yielded across the
+    whole batch; remaining files are skipped once the cap is reached.
+    """
+    remaining = max_entities
+    path_iter = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        # keep the pool fed without materializing a future per path upfront
+        window = 4 * (workers or os.cpu_count() or 1)
+
+        def submit_more():
+            while len(pending) < window:
+                path = next(path_iter, None)
+                if path is None:
+                    return
+                cap = remaining if 0 <= max_entities else -1
+                pending[executor.submit(_parse_one, path, cap)] = path
+
+        submit_more()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                entities = future.result()
+                if 0 <= max_entities:
+                    entities = entities[:remaining]
+                    remaining -= len(entities)
+                yield path, entities
+                if 0 <= max_entities and remaining == 0:
+                    for f in pending:
+                        f.cancel()
+                    return
+            submit_more()
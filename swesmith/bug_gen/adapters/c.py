@@ -1,39 +1,62 @@
 import re
 import tree_sitter_c as tsc
 
+from functools import cached_property
+from pathlib import Path
 from swesmith.constants import TODO_REWRITE, CodeEntity
 from tree_sitter import Language, Parser, Query, QueryCursor
-from swesmith.bug_gen.adapters.utils import build_entity
+from swesmith.bug_gen.adapters.utils import (
+    build_entity,
+    detach_for_cache,
+    entity_cache_key,
+    load_cached_entities,
+    store_cached_entities,
+)
 
 C_LANGUAGE = Language(tsc.language())
 
+# Compiled once at import time; Query construction is expensive and the
+# patterns are static, so per-property-access compilation just burns CPU
+_FUNC_NAME_QUERY = Query(
+    C_LANGUAGE,
+    "(function_definition (function_declarator declarator: (identifier) @name))",
+)
+_FUNC_BODY_QUERY = Query(
+    C_LANGUAGE, "(function_definition body: (compound_statement) @body)"
+)
+
+# Single-pass signature normalization: "(  " -> "(", "  )" -> ")", any
+# other whitespace run -> " " (replaces three chained re.sub passes)
+_SIG_WS_RE = re.compile(r"\(\s+|\s+\)|\s+")
+
+
+def _sig_ws_repl(m: re.Match) -> str:
+    s = m.group()
+    if s[0] == "(":
+        return "("
+    if s[-1] == ")":
+        return ")"
+    return " "
+
 
 class CEntity(CodeEntity):
-    @property
+    @cached_property
     def name(self) -> str:
-        func_query = Query(
-            C_LANGUAGE,
-            "(function_definition (function_declarator declarator: (identifier) @name))",
+        func_name = self._extract_text_from_first_match(
+            _FUNC_NAME_QUERY, self.node, "name"
         )
-        func_name = self._extract_text_from_first_match(func_query, self.node, "name")
         if func_name:
             return func_name
         return ""
 
-    @property
+    @cached_property
     def signature(self) -> str:
-        body_query = Query(
-            C_LANGUAGE, "(function_definition body: (compound_statement) @body)"
-        )
-        matches = QueryCursor(body_query).matches(self.node)
+        matches = QueryCursor(_FUNC_BODY_QUERY).matches(self.node)
         if matches:
             body_node = matches[0][1]["body"][0]
             body_start_byte = body_node.start_byte - self.node.start_byte
             signature = self.node.text[:body_start_byte].strip().decode("utf-8")
-            signature = re.sub(r"\(\s+", "(", signature).strip()
-            signature = re.sub(r"\s+\)", ")", signature).strip()
-            signature = re.sub(r"\s+", " ", signature).strip()
-            return signature
+            return _SIG_WS_RE.sub(_sig_ws_repl, signature).strip()
         return ""
 
     @property
@@ -56,27 +79,47 @@ def get_entities_from_file_c(
     Parse a .c file and return up to max_entities top-level funcs and types.
     If max_entities < 0, collects them all.
     """
-    parser = Parser(C_LANGUAGE)
+    # tree-sitter consumes bytes directly; decode once for line indexing
+    # instead of the old read-as-str + re-encode round trip
+    source = Path(file_path).read_bytes()
 
-    file_content = open(file_path, "r", encoding="utf8").read()
-    tree = parser.parse(bytes(file_content, "utf8"))
+    cache_key = entity_cache_key(source)
+    cached = load_cached_entities("c", cache_key, file_path)
+    if cached is not None:
+        for entity in cached:
+            if 0 <= max_entities == len(entities):
+                return
+            entities.append(entity)
+        return
+    start = len(entities)
+
+    parser = Parser(C_LANGUAGE)
+    tree = parser.parse(source)
     root = tree.root_node
-    lines = file_content.splitlines()
+    lines = source.decode("utf8").splitlines()
 
-    def walk(node) -> None:
+    # iterative pre-order traversal; recursion can blow the stack on
+    # deeply nested (often generated) sources
+    stack = [root]
+    while stack:
         # stop if we've hit the limit
         if 0 <= max_entities == len(entities):
             return
 
+        node = stack.pop()
+
         # not checking for error nodes here because tree-sitter-c frequently
         # generates them parsing valid pre-processor directives
 
         if node.type == "function_definition":
             entities.append(build_entity(node, lines, file_path, CEntity))
-            if 0 <= max_entities == len(entities):
-                return
+            # C has no nested functions, so nothing to find below this node
+            continue
 
-        for child in node.children:
-            walk(child)
+        stack.extend(reversed(node.children))
 
-    walk(root)
+    # traversal ran to completion (no max_entities cutoff), so this is the
+    # file's full entity list - safe to cache for replays
+    store_cached_entities(
+        "c", cache_key, detach_for_cache(entities[start:], ("name", "signature"))
+    )
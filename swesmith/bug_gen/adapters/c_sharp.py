@@ -1,43 +1,69 @@
 import re
 import warnings
 
+from functools import cached_property
+from pathlib import Path
 from swesmith.constants import CodeEntity, TODO_REWRITE
 from tree_sitter import Language, Parser, Query, QueryCursor
 import tree_sitter_c_sharp as tscs
-from swesmith.bug_gen.adapters.utils import build_entity
+from swesmith.bug_gen.adapters.utils import (
+    build_entity,
+    detach_for_cache,
+    entity_cache_key,
+    load_cached_entities,
+    store_cached_entities,
+)
 
 C_SHARP_LANGUAGE = Language(tscs.language())
 
+# Compiled once at import time; Query construction is expensive and the
+# patterns are static, so per-property-access compilation just burns CPU
+_MEMBER_NAME_QUERY = Query(
+    C_SHARP_LANGUAGE,
+    """
+        (constructor_declaration name: (identifier) @name)
+        (destructor_declaration name: (identifier) @name)
+        (method_declaration name: (identifier) @name)
+    """,
+)
+_MEMBER_BODY_QUERY = Query(
+    C_SHARP_LANGUAGE,
+    """
+    [
+      (constructor_declaration body: (block) @body)
+      (destructor_declaration body: (block) @body)
+      (method_declaration body: (block) @body)
+    ]
+    """.strip(),
+)
+
+# Single-pass signature normalization: "(  " -> "(", "  )" -> ")", any
+# other whitespace run -> " " (replaces three chained re.sub passes)
+_SIG_WS_RE = re.compile(r"\(\s+|\s+\)|\s+")
+
+
+def _sig_ws_repl(m: re.Match) -> str:
+    s = m.group()
+    if s[0] == "(":
+        return "("
+    if s[-1] == ")":
+        return ")"
+    return " "
+
 
 class CSharpEntity(CodeEntity):
-    @property
+    @cached_property
     def name(self) -> str:
-        name_query = Query(
-            C_SHARP_LANGUAGE,
-            """
-                (constructor_declaration name: (identifier) @name)
-                (destructor_declaration name: (identifier) @name)
-                (method_declaration name: (identifier) @name)
-            """,
+        name = self._extract_text_from_first_match(
+            _MEMBER_NAME_QUERY, self.node, "name"
         )
-        name = self._extract_text_from_first_match(name_query, self.node, "name")
         if self.node.type == "destructor_declaration":
             name = f"{name} Finalizer"
         return name or ""
 
-    @property
+    @cached_property
     def signature(self) -> str:
-        body_query = Query(
-            C_SHARP_LANGUAGE,
-            """
-            [
-              (constructor_declaration body: (block) @body)
-              (destructor_declaration body: (block) @body)
-              (method_declaration body: (block) @body)
-            ]
-            """.strip(),
-        )
-        matches = QueryCursor(body_query).matches(self.node)
+        matches = QueryCursor(_MEMBER_BODY_QUERY).matches(self.node)
         if matches:
             body_node = matches[0][1]["body"][0]
             signature = (
@@ -45,10 +71,7 @@ class CSharpEntity(CodeEntity):
                 .rstrip()
                 .decode("utf-8")
             )
-            signature = re.sub(r"\(\s+", "(", signature).strip()
-            signature = re.sub(r"\s+\)", ")", signature).strip()
-            signature = re.sub(r"\s+", " ", signature).strip()
-            return signature
+            return _SIG_WS_RE.sub(_sig_ws_repl, signature).strip()
         return ""
 
     @property
@@ -71,43 +94,65 @@ def get_entities_from_file_c_sharp(
     Parse a .cs file and return up to max_entities methods.
     If max_entities < 0, collects them all.
     """
-    parser = Parser(C_SHARP_LANGUAGE)
+    # tree-sitter consumes bytes directly; decode once for line indexing
+    # instead of the old read-as-str + re-encode round trip
+    source = Path(file_path).read_bytes()
+
+    cache_key = entity_cache_key(source)
+    cached = load_cached_entities("cs", cache_key, file_path)
+    if cached is not None:
+        for entity in cached:
+            if 0 <= max_entities == len(entities):
+                return
+            entities.append(entity)
+        return
+    start = len(entities)
 
     try:
-        file_content = open(file_path, "r", encoding="utf8").read()
+        lines = source.decode("utf8").splitlines()
     except UnicodeDecodeError:
         warnings.warn(f"Ignoring file {file_path} as it has an unsupported encoding")
         return
 
-    tree = parser.parse(bytes(file_content, "utf8"))
+    parser = Parser(C_SHARP_LANGUAGE)
+    tree = parser.parse(source)
     root = tree.root_node
-    lines = file_content.splitlines()
 
-    def walk(node) -> None:
+    # iterative pre-order traversal; recursion can blow the stack on
+    # deeply nested (often generated) sources
+    stack = [root]
+    saw_error = False
+    while stack:
         # stop if we've hit the limit
         if 0 <= max_entities == len(entities):
             return
 
+        node = stack.pop()
+
         if node.type == "ERROR":
             warnings.warn(f"Error encountered parsing {file_path}")
-            return
+            saw_error = True
+            continue
 
         if node.type in [
             "constructor_declaration",
             "destructor_declaration",
             "method_declaration",
         ]:
-            if node.type == "method_declaration" and not _has_body(node):
-                pass
-            else:
+            if not (node.type == "method_declaration" and not _has_body(node)):
                 entities.append(build_entity(node, lines, file_path, CSharpEntity))
-                if 0 <= max_entities == len(entities):
-                    return
+                # members don't nest, so nothing to find below this node
+                continue
 
-        for child in node.children:
-            walk(child)
+        stack.extend(reversed(node.children))
 
-    walk(root)
+    # traversal ran to completion (no max_entities cutoff), so this is the
+    # file's full entity list - safe to cache for replays; skip files with
+    # parse errors so their warning fires again on re-runs
+    if not saw_error:
+        store_cached_entities(
+            "cs", cache_key, detach_for_cache(entities[start:], ("name", "signature"))
+        )
 
 
 def _has_body(node) -> bool:
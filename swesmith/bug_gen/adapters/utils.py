@@ -2,12 +2,88 @@
 Utility functions for language adapters.
 """
 
+import copy
+import hashlib
+import os
+import pickle
 import re
+from pathlib import Path
 from typing import TypeVar, Type
 from swesmith.constants import CodeEntity
 
 T = TypeVar("T", bound=CodeEntity)
 
+# On-disk entity cache keyed by source content hash. Bug-gen methods
+# (procedural, llm-modify, llm-rewrite) re-parse the same checkout, so
+# replays hit the cache instead of re-walking the tree-sitter tree.
+# Tree-sitter nodes aren't picklable, so only adapters whose entities
+# are fully materialized without a live node (see detach_for_cache
+# callers) can use it.
+# The schema version invalidates everything cached when entity parsing,
+# signature normalization, or the detach format changes - bump it with
+# any such change.
+ENTITY_CACHE_SCHEMA = 1
+_DEFAULT_ENTITY_CACHE_DIR = Path(os.path.expanduser("~/.cache/swesmith/entities"))
+
+
+def entity_cache_dir() -> Path:
+    """Cache root; SWESMITH_ENTITY_CACHE_DIR overrides (used for test isolation)."""
+    override = os.environ.get("SWESMITH_ENTITY_CACHE_DIR")
+    return Path(override) if override else _DEFAULT_ENTITY_CACHE_DIR
+
+
+def entity_cache_key(file_content: bytes) -> str:
+    return hashlib.blake2b(file_content, digest_size=16).hexdigest()
+
+
+def load_cached_entities(ext: str, key: str, file_path: str) -> list[T] | None:
+    """Return the cached entity list for (ext, content-key), or None on miss."""
+    try:
+        with open(entity_cache_dir() / ext / f"{key}.pkl", "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("schema") != ENTITY_CACHE_SCHEMA:
+        return None
+    entities = payload["entities"]
+    for entity in entities:
+        # keys are content-only; identical content may live at another path
+        entity.file_path = file_path
+    return entities
+
+
+def store_cached_entities(ext: str, key: str, entities: list[T]) -> None:
+    """Persist an entity list; failures are non-fatal (cache is best-effort)."""
+    cache_dir = entity_cache_dir() / ext
+    target = cache_dir / f"{key}.pkl"
+    tmp = cache_dir / f"{key}.{os.getpid()}.tmp"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(
+                {"schema": ENTITY_CACHE_SCHEMA, "entities": entities},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def detach_for_cache(entities: list[T], force: tuple[str, ...]) -> list[T]:
+    """
+    Copy entities with the unpicklable tree-sitter node stripped, after
+    forcing the named cached properties so they survive without it.
+    """
+    detached = []
+    for entity in entities:
+        for attr in force:
+            getattr(entity, attr)
+        clone = copy.copy(entity)
+        clone.node = None
+        detached.append(clone)
+    return detached
+
 
 def build_entity(
     node,
@@ -20,6 +20,10 @@ from swesmith.profiles import registry
 
 def read_test_output(filename: str):
     content = Path(filename).read_text(errors="replace")
+    return read_test_output_str(content)
+
+
+def read_test_output_str(content: str):
     if APPLY_PATCH_FAIL in content:
         return None, False
     if TESTS_TIMEOUT in content:
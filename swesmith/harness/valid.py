@@ -242,7 +242,7 @@ def main(
     bug_patches: str,
     workers: int,
     redo_existing: bool = False,
-) -> None:
+) -> list[Path]:
     # Bug patch should be a dict that looks like this:
     # {
     #     "instance_id": <instance_id>,
@@ -273,7 +273,7 @@ def main(
     print(f"Found {len(bug_patches)} candidate patches.")
     if len(bug_patches) == 0:
         print("No candidate patches found in input file. Exiting.")
-        return
+        return []
 
     completed = []
     report_dirs = []
@@ -344,7 +344,7 @@ def main(
         print("No patches to run.")
         for report_dir in report_dirs:
             print_report(report_dir)
-        return
+        return report_dirs
 
     # Initialize progress bar and stats
     stats = {"fail": 0, "timeout": 0, "0_f2p": 0, "1+_f2p": 0}
@@ -369,6 +369,7 @@ def main(
     print("All instances run.")
     for report_dir in report_dirs:
         print_report(report_dir)
+    return report_dirs
 
 
 if __name__ == "__main__":
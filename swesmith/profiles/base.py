@@ -498,7 +498,7 @@ class RepoProfile(ABC, metaclass=SingletonMeta):
             List[CodeEntity]: List of CodeEntity objects containing entity information.
         """
         # Lazy import to avoid loading tree-sitter dependencies when not needed
-        from swesmith.bug_gen.adapters import get_entities_from_file
+        from swesmith.bug_gen.adapters.batch import parse_files
 
         if not self.exts:
             raise ValueError(
@@ -506,7 +506,7 @@ class RepoProfile(ABC, metaclass=SingletonMeta):
             )
 
         dir_path, cloned = self.clone()
-        entities = []
+        file_paths = []
         for root, _, files in os.walk(dir_path):
             for file in files:
                 if exclude_tests and self._is_test_path(root, file):
@@ -526,7 +526,18 @@ class RepoProfile(ABC, metaclass=SingletonMeta):
                 file_ext = Path(file_path).suffix
                 if file_ext not in self.exts:
                     continue
-                get_entities_from_file[file_ext](entities, file_path, max_entities)
+                file_paths.append(file_path)
+
+        # Extract concurrently, then apply the cap in walk order so results
+        # stay deterministic regardless of which file finishes first
+        per_file = dict(parse_files(file_paths))
+        entities = []
+        for file_path in file_paths:
+            remaining = -1 if max_entities < 0 else max_entities - len(entities)
+            if remaining == 0:
+                break
+            file_entities = per_file[file_path]
+            entities.extend(file_entities if remaining < 0 else file_entities[:remaining])
         if cloned:
             shutil.rmtree(dir_path)
         return entities
@@ -726,6 +737,7 @@ class Registry(UserDict):
     def __init__(self, github_token: str | None = None):
         super().__init__()
         self.github_token = github_token
+        self._by_class_name: dict[str, type] | None = None
 
     def register_profile(self, profile_class: type):
         """Register a RepoProfile subclass (except base types)."""
@@ -742,6 +754,20 @@ class Registry(UserDict):
         p = profile_class()
         self.data[p.repo_name] = profile_class
         self.data[p.mirror_name] = profile_class
+        self._by_class_name = None  # invalidate memoized name index
+
+    def get_by_name(self, class_name: str) -> type | None:
+        """Get a profile class by its class name (e.g. 'ZodProfile').
+
+        The class-name index is built once per registry state and reused,
+        so repeated lookups don't rescan all registered profiles (there can
+        be hundreds after auto-profiling).
+        """
+        if self._by_class_name is None:
+            self._by_class_name = {
+                cls.__name__: cls for cls in self.data.values()
+            }
+        return self._by_class_name.get(class_name)
 
     def get(self, key: str) -> RepoProfile:
         """Get a profile class by mirror name or repo name."""
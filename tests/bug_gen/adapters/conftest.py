@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_entity_cache(tmp_path, monkeypatch):
+    """Point the on-disk entity cache at a per-test directory.
+
+    Keeps adapter tests independent of mutable state under $HOME - a warm
+    user cache would otherwise mask parser regressions on reruns.
+    """
+    monkeypatch.setenv("SWESMITH_ENTITY_CACHE_DIR", str(tmp_path / "entity_cache"))
@@ -0,0 +1,49 @@
+from swesmith.bug_gen.adapters.batch import parse_files
+
+
+def _write_sources(tmp_path, n):
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"f{i}.c"
+        p.write_text(
+            f"int f{i}a(void) {{ return {i}; }}\nint f{i}b(void) {{ return {i}; }}\n"
+        )
+        paths.append(str(p))
+    return paths
+
+
+def test_parse_files_yields_every_path(tmp_path):
+    paths = _write_sources(tmp_path, 5)
+    results = dict(parse_files(paths, workers=3))
+    assert set(results) == set(paths)
+    assert all(len(entities) == 2 for entities in results.values())
+
+
+def test_parse_files_entity_names(tmp_path):
+    paths = _write_sources(tmp_path, 1)
+    results = dict(parse_files(paths))
+    assert sorted(e.name for e in results[paths[0]]) == ["f0a", "f0b"]
+
+
+def test_parse_files_unsupported_extension(tmp_path):
+    unknown = tmp_path / "data.unknown"
+    unknown.write_text("not source code")
+    results = dict(parse_files([str(unknown)]))
+    assert results[str(unknown)] == []
+
+
+def test_parse_files_global_cap(tmp_path):
+    paths = _write_sources(tmp_path, 4)
+    results = list(parse_files(paths, max_entities=3, workers=2))
+    assert sum(len(entities) for _, entities in results) == 3
+
+
+def test_parse_files_empty_input():
+    assert list(parse_files([])) == []
+
+
+def test_parse_files_many_paths_bounded_window(tmp_path):
+    # more paths than 4x workers, exercising incremental submission
+    paths = _write_sources(tmp_path, 20)
+    results = dict(parse_files(paths, workers=2))
+    assert len(results) == 20
@@ -0,0 +1,98 @@
+import pickle
+
+from swesmith.bug_gen.adapters.c import get_entities_from_file_c
+from swesmith.bug_gen.adapters.utils import (
+    ENTITY_CACHE_SCHEMA,
+    detach_for_cache,
+    entity_cache_dir,
+    entity_cache_key,
+    load_cached_entities,
+    store_cached_entities,
+)
+
+
+def _extract(path):
+    entities = []
+    get_entities_from_file_c(entities, str(path))
+    return entities
+
+
+def test_entity_cache_round_trip(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("int foo(int a,\n  int b) { return a + b; }\n")
+    key = entity_cache_key(src.read_bytes())
+
+    assert load_cached_entities("c", key, str(src)) is None
+
+    entities = _extract(src)
+    store_cached_entities("c", key, detach_for_cache(entities, ("name", "signature")))
+
+    cached = load_cached_entities("c", key, str(src))
+    assert [e.name for e in cached] == [e.name for e in entities]
+    assert [e.signature for e in cached] == [e.signature for e in entities]
+    assert [e.src_code for e in cached] == [e.src_code for e in entities]
+
+
+def test_entity_cache_rebinds_file_path(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("int foo(void) { return 1; }\n")
+    key = entity_cache_key(src.read_bytes())
+    store_cached_entities(
+        "c", key, detach_for_cache(_extract(src), ("name", "signature"))
+    )
+
+    # identical content at another path must come back with that path
+    other = tmp_path / "b.c"
+    cached = load_cached_entities("c", key, str(other))
+    assert all(e.file_path == str(other) for e in cached)
+
+
+def test_entity_cache_rejects_schema_mismatch(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("int foo(void) { return 1; }\n")
+    key = entity_cache_key(src.read_bytes())
+    store_cached_entities(
+        "c", key, detach_for_cache(_extract(src), ("name", "signature"))
+    )
+
+    cache_file = entity_cache_dir() / "c" / f"{key}.pkl"
+    payload = pickle.loads(cache_file.read_bytes())
+    assert payload["schema"] == ENTITY_CACHE_SCHEMA
+    payload["schema"] = ENTITY_CACHE_SCHEMA - 1
+    cache_file.write_bytes(pickle.dumps(payload))
+
+    assert load_cached_entities("c", key, str(src)) is None
+
+
+def test_entity_cache_rejects_corrupt_file(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("int foo(void) { return 1; }\n")
+    key = entity_cache_key(src.read_bytes())
+    cache_file = entity_cache_dir() / "c" / f"{key}.pkl"
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_bytes(b"not a pickle")
+
+    assert load_cached_entities("c", key, str(src)) is None
+
+
+def test_detach_for_cache_strips_node_and_keeps_originals():
+    class FakeEntity:
+        def __init__(self):
+            self.node = object()
+            self.name = "foo"
+
+    entities = [FakeEntity()]
+    detached = detach_for_cache(entities, ("name",))
+    assert detached[0].node is None
+    assert detached[0].name == "foo"
+    assert entities[0].node is not None
+
+
+def test_second_extraction_served_from_cache(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("int foo(void) { return 1; }\nint bar(void) { return 2; }\n")
+    first = _extract(src)
+    second = _extract(src)
+    assert [e.name for e in first] == [e.name for e in second] == ["foo", "bar"]
+    # cache hits serve detached entities
+    assert all(e.node is None for e in second)
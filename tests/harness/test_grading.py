@@ -1,11 +1,16 @@
 import json
 
+import pytest
+
 from swebench.harness.constants import (
+    APPLY_PATCH_FAIL,
     KEY_INSTANCE_ID,
     KEY_MODEL,
     KEY_PREDICTION,
+    TESTS_TIMEOUT,
     TestStatus,
 )
+from swesmith.constants import TEST_OUTPUT_END, TEST_OUTPUT_START
 from swesmith.harness import grading
 
 
@@ -50,6 +55,49 @@ pandas/tests/indexing/test_datetime.py::TestDatetimeIndex::test_getitem_pyarrow_
     assert test_output == expected
 
 
+def test_read_test_output_str_extracts_between_markers():
+    # Sentinel format written by the remote validator (set -x trace of the
+    # `: 'marker'` no-ops); host-side parsing must match it exactly
+    content = (
+        "some preamble\n"
+        f"+ : '{TEST_OUTPUT_START}'\n"
+        "test one PASSED\n"
+        "test two FAILED\n"
+        f"+ : '{TEST_OUTPUT_END}'\n"
+        "trailing noise\n"
+    )
+    output, found = grading.read_test_output_str(content)
+    assert found
+    assert output == "\ntest one PASSED\ntest two FAILED\n"
+
+
+def test_read_test_output_str_apply_patch_failed():
+    content = f"{APPLY_PATCH_FAIL}\nsome output\n"
+    output, found = grading.read_test_output_str(content)
+    assert output is None
+    assert not found
+
+
+def test_read_test_output_str_tests_timed_out():
+    content = f"+ : '{TEST_OUTPUT_START}'\npartial output\n{TESTS_TIMEOUT}\n"
+    output, found = grading.read_test_output_str(content)
+    assert output is None
+    assert not found
+
+
+def test_read_test_output_str_missing_markers():
+    content = "raw log without any sentinels\n"
+    output, found = grading.read_test_output_str(content)
+    assert output == content
+    assert not found
+
+
+def test_read_test_output_str_markers_out_of_order():
+    content = f"+ : '{TEST_OUTPUT_END}'\noutput\n+ : '{TEST_OUTPUT_START}'\n"
+    with pytest.raises(ValueError):
+        grading.read_test_output_str(content)
+
+
 def test_get_eval_report(task_instance_path, logs_run_evaluation):
     instance_id = "pandas-dev__pandas.95280573.pr_53652"
     with open(task_instance_path) as f: